@@ -8,6 +8,8 @@ All functions work with dictionaries for easy data manipulation.
 
 import sqlite3
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -18,11 +20,56 @@ from typing import Dict, List, Optional
 
 AUDIOBOOK_DB_PATH = "database/audiobook.db"
 
+# Connection shared by writes inside audiobook_db_transaction(), per thread
+_transaction = threading.local()
+
 def get_db_connection():
     """Get connection to audiobook database."""
     return sqlite3.connect(AUDIOBOOK_DB_PATH)
 
 
+@contextmanager
+def audiobook_db_transaction():
+    """Group update_book_record/log_simple calls into a single commit.
+    
+    Writes made inside the block share one connection and are committed
+    together when it exits (rolled back if it raises). Nested blocks join
+    the outer transaction.
+    
+    Examples:
+        >>> with audiobook_db_transaction():
+        ...     update_book_record(book_dict)
+        ...     log_simple(book_id, "Started", 'INFO', 'stage_start')
+    """
+    if getattr(_transaction, 'conn', None) is not None:
+        yield _transaction.conn
+        return
+    
+    conn = get_db_connection()
+    _transaction.conn = conn
+    try:
+        with conn:  # commit on success, rollback on error
+            yield conn
+    finally:
+        _transaction.conn = None
+        conn.close()
+
+
+@contextmanager
+def _write_connection():
+    """Yield the open transaction's connection, or a new one committed on exit."""
+    if getattr(_transaction, 'conn', None) is not None:
+        yield _transaction.conn
+        return
+    
+    conn = get_db_connection()
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
 ################################################################################
 # GET DATA FUNCTIONS
 ################################################################################
@@ -57,6 +104,36 @@ def get_all_books() -> List[Dict]:
         return []
 
 
+def get_book_by_id(book_id: str) -> Optional[Dict]:
+    """Get a single book by book_id, or None if not found.
+    
+    Same columns as get_all_books(), looked up through the unique
+    books.book_id index instead of scanning every book.
+    """
+    try:
+        db_path = get_normalized_db_path()
+        with sqlite3.connect(db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT b.id, b.book_id, b.book_name as book_title, b.author,
+                       n.narrator_name as narrated_by,
+                       ap.status, ap.created_at, ap.updated_at
+                FROM books b
+                LEFT JOIN audiobook_productions ap ON b.book_id = ap.book_id
+                LEFT JOIN narrators n ON ap.narrator_id = n.narrator_id
+                WHERE b.book_id = ?
+                LIMIT 1
+            """, (book_id,))
+            
+            row = cursor.fetchone()
+            return dict(row) if row else None
+            
+    except Exception as e:
+        print(f"ERROR: Failed to get book {book_id}: {e}")
+        return None
+
+
 def get_processable_books() -> List[Dict]:
     """Get books that can be processed (pending or failed within retry limit)."""
     all_books = get_all_books()
@@ -82,7 +159,7 @@ def update_book_record(book_dict: Dict) -> bool:
     print(f"Updating database record for book_id: {book_id}")
     
     try:
-        with get_db_connection() as conn:
+        with _write_connection() as conn:
             cursor = conn.cursor()
             
             # Update with current timestamp
@@ -182,7 +259,6 @@ def update_book_record(book_dict: Dict) -> bool:
                 book_id
             ))
             
-            conn.commit()
             print(f"Database record updated successfully")
             return True
             
@@ -201,7 +277,7 @@ def log_simple(book_id: str, message: str, level: str = 'INFO', event_type: str
     print(f"[{level}] {message}")
     
     try:
-        with get_db_connection() as conn:
+        with _write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO audiobook_logs 
@@ -217,7 +293,6 @@ def log_simple(book_id: str, message: str, level: str = 'INFO', event_type: str
                 stage,
                 status
             ))
-            conn.commit()
             return True
             
     except Exception as e:
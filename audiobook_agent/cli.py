@@ -14,19 +14,31 @@ import sys
 import os
 import argparse
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
+# Reads WAV/FLAC (and MP3 with libsndfile >= 1.1) durations from the file
+# header in-process; optional, ffprobe is used when it is missing
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
 # Audiobook pipeline modules imported as needed within functions
 
 # Configuration
 MAX_HOURS_PER_PART = 10  # Maximum hours per audiobook part (configurable for YouTube limits)
+FFPROBE_WORKERS = min(32, (os.cpu_count() or 1) * 2)  # Concurrent ffprobe processes when measuring durations
+DEBUG = os.environ.get("E3_DEBUG", "").lower() in ("1", "true", "yes")  # Verbose job-check output
+COPY_WORKERS = 16  # Concurrent file copies when moving audio across volumes
+AUDIO_EXTENSIONS = ('.flac', '.wav', '.mp3')  # Speech file types, in the order they are summed
 
 from .parse_novel_tts import parse_novel
 from .create_tts_audio_jobs import create_tts_jobs
-from .audiobook_helper import get_all_books, get_processable_books, update_book_record, log_simple, mark_stage_completed, mark_stage_failed
+from .audiobook_helper import get_all_books, get_processable_books, update_book_record, log_simple, mark_stage_completed, mark_stage_failed, audiobook_db_transaction
 
 
 def _parse_with_langchain(input_file: str, verbose: bool = True) -> dict:
@@ -89,8 +101,9 @@ def parse_one_book(book_record: Dict, output_dir: str, parser: str = "legacy") -
     
     # Update dict to processing status
     book_record['parse_novel_status'] = 'processing'
-    update_book_record(book_record)  # Sync to database
-    log_simple(book_id, f"Started parsing '{book_title}'", 'INFO', 'parse_start')
+    with audiobook_db_transaction():
+        update_book_record(book_record)  # Sync to database
+        log_simple(book_id, f"Started parsing '{book_title}'", 'INFO', 'parse_start')
     
     try:
         if parser == "langchain":
@@ -114,8 +127,9 @@ def parse_one_book(book_record: Dict, output_dir: str, parser: str = "legacy") -
             book_record['total_words'] = result['total_words_all_books']
             
             # Sync back to database
-            update_book_record(book_record)
-            log_simple(book_id, f"Parse completed - {book_record['total_chapters']} chapters, {book_record['total_words']} words", 'INFO', 'parse_complete')
+            with audiobook_db_transaction():
+                update_book_record(book_record)
+                log_simple(book_id, f"Parse completed - {book_record['total_chapters']} chapters, {book_record['total_words']} words", 'INFO', 'parse_complete')
             
             print(f"Parse completed successfully!")
             print(f"   Total chapters: {book_record['total_chapters']}")
@@ -125,8 +139,9 @@ def parse_one_book(book_record: Dict, output_dir: str, parser: str = "legacy") -
         else:
             # Update dict with failure
             book_record = mark_stage_failed(book_record, 'parse_novel')
-            update_book_record(book_record)
-            log_simple(book_id, f"Parse failed: {result.get('error', 'Unknown error')}", 'ERROR', 'parse_failed')
+            with audiobook_db_transaction():
+                update_book_record(book_record)
+                log_simple(book_id, f"Parse failed: {result.get('error', 'Unknown error')}", 'ERROR', 'parse_failed')
             
             print(f"Parse failed: {result.get('error', 'Unknown error')}")
             return False
@@ -134,8 +149,9 @@ def parse_one_book(book_record: Dict, output_dir: str, parser: str = "legacy") -
     except Exception as e:
         # Update dict with failure
         book_record = mark_stage_failed(book_record, 'parse_novel')
-        update_book_record(book_record)
-        log_simple(book_id, f"Parse error: {e}", 'ERROR', 'parse_error')
+        with audiobook_db_transaction():
+            update_book_record(book_record)
+            log_simple(book_id, f"Parse error: {e}", 'ERROR', 'parse_error')
         
         print(f"Parse error: {e}")
         return False
@@ -194,23 +210,25 @@ def generate_audio_jobs_for_book(book_dict: Dict, processing_dir: str) -> bool:
             # Update database with job count
             book_dict['total_audio_files'] = result['total_jobs_created']
             book_dict = mark_stage_completed(book_dict, 'audio_generation')
-            update_book_record(book_dict)
-            
-            log_simple(book_id, f"Audio jobs created: {result['total_jobs_created']} jobs", 'INFO', 'audio_jobs_complete')
+            with audiobook_db_transaction():
+                update_book_record(book_dict)
+                log_simple(book_id, f"Audio jobs created: {result['total_jobs_created']} jobs", 'INFO', 'audio_jobs_complete')
             print(f"Audio jobs created: {result['total_jobs_created']} jobs")
             print(f"   Jobs location: {jobs_output_dir}")
             return True
         else:
             book_dict = mark_stage_failed(book_dict, 'audio_generation')
-            update_book_record(book_dict)
-            log_simple(book_id, f"Audio job creation failed: {result.get('error', 'Unknown error')}", 'ERROR', 'audio_jobs_failed')
+            with audiobook_db_transaction():
+                update_book_record(book_dict)
+                log_simple(book_id, f"Audio job creation failed: {result.get('error', 'Unknown error')}", 'ERROR', 'audio_jobs_failed')
             print(f"Audio job creation failed")
             return False
             
     except Exception as e:
         book_dict = mark_stage_failed(book_dict, 'audio_generation')
-        update_book_record(book_dict)
-        log_simple(book_id, f"Audio job creation error: {e}", 'ERROR', 'audio_jobs_error')
+        with audiobook_db_transaction():
+            update_book_record(book_dict)
+            log_simple(book_id, f"Audio job creation error: {e}", 'ERROR', 'audio_jobs_error')
         print(f"Audio job creation error: {e}")
         return False
 
@@ -268,6 +286,12 @@ def analyze_entities_for_book(
 # STEP 5: CHECK AUDIO JOBS COMPLETION
 ################################################################################
 
+def _debug(message: str) -> None:
+    """Print a diagnostic line when the E3_DEBUG environment variable is set."""
+    if DEBUG:
+        print(f"DEBUG: {message}")
+
+
 def check_audio_jobs_completion(book_dict: Dict) -> bool:
     """Check if all audio jobs for this book are completed."""
     print(f"\nSTEP 5: Checking audio jobs completion...")
@@ -292,66 +316,61 @@ def check_audio_jobs_completion(book_dict: Dict) -> bool:
     try:
         # Query ComfyUI jobs database for completed jobs
         import sqlite3
-        query_pattern = f"SPEECH_{book_id}_%"
-        print(f"DEBUG: Querying jobs with pattern: {query_pattern}")
+        
+        # Names starting with "SPEECH_{book_id}_" as a range on config_name,
+        # which the config_name index serves directly (LIKE is case-insensitive
+        # and so cannot use it); "`" is the character after "_"
+        name_prefix = f"SPEECH_{book_id}_"
+        name_upper = f"SPEECH_{book_id}`"
+        _debug(f"Querying jobs with names in [{name_prefix}, {name_upper})")
         
         with sqlite3.connect("database/comfyui_agent.db") as conn:
             cursor = conn.cursor()
             
-            # Debug: Show some sample job names first
-            cursor.execute("""
-                SELECT config_name, status FROM comfyui_jobs 
-                WHERE config_name LIKE ? LIMIT 5
-            """, (query_pattern,))
-            sample_jobs = cursor.fetchall()
-            print(f"DEBUG: Sample jobs found:")
-            for job_name, status in sample_jobs:
-                print(f"  {job_name} -> {status}")
-            
-            # Now get the actual count
             cursor.execute("""
                 SELECT COUNT(*) FROM comfyui_jobs 
-                WHERE config_name LIKE ? AND status = 'done'
-            """, (query_pattern,))
+                WHERE config_name >= ? AND config_name < ? AND status = 'done'
+            """, (name_prefix, name_upper))
             
             completed_count = cursor.fetchone()[0]
-            print(f"DEBUG: Database query returned {completed_count} completed jobs")
+            _debug(f"Database query returned {completed_count} completed jobs")
         
         # Update progress in audiobook database
-        print(f"DEBUG: Updating audio_jobs_completed from {current_completed} to {completed_count}")
+        _debug(f"Updating audio_jobs_completed from {current_completed} to {completed_count}")
         book_dict['audio_jobs_completed'] = completed_count
         
-        # Force database update
-        success = update_book_record(book_dict)
-        print(f"DEBUG: Database update success: {success}")
+        # Record progress and status changes in one transaction
+        with audiobook_db_transaction():
+            success = update_book_record(book_dict)
+            _debug(f"Database update success: {success}")
         
-        print(f"Audio jobs progress: {completed_count}/{total_jobs} completed")
-        log_simple(book_id, f"Audio jobs progress: {completed_count}/{total_jobs}", 'INFO', 'audio_progress_check')
+            print(f"Audio jobs progress: {completed_count}/{total_jobs} completed")
+            log_simple(book_id, f"Audio jobs progress: {completed_count}/{total_jobs}", 'INFO', 'audio_progress_check')
         
-        if completed_count >= total_jobs:
-            # All done - mark audio generation completed
-            print(f"DEBUG: All jobs completed! Marking status as 'completed'")
-            book_dict['audio_generation_status'] = 'completed'
-            book_dict['audio_generation_completed_at'] = datetime.now().isoformat()
-            update_success = update_book_record(book_dict)
-            print(f"DEBUG: Status update success: {update_success}")
+            if completed_count >= total_jobs:
+                # All done - mark audio generation completed
+                _debug(f"All jobs completed! Marking status as 'completed'")
+                book_dict['audio_generation_status'] = 'completed'
+                book_dict['audio_generation_completed_at'] = datetime.now().isoformat()
+                update_success = update_book_record(book_dict)
+                _debug(f"Status update success: {update_success}")
             
-            log_simple(book_id, f"All audio jobs completed ({completed_count}/{total_jobs})", 'INFO', 'audio_complete')
-            print(f"All audio jobs completed - ready for next stage")
-            return True
-        else:
-            # Keep as processing
-            print(f"DEBUG: Jobs still processing, keeping status as 'processing'")
-            book_dict['audio_generation_status'] = 'processing'
-            update_success = update_book_record(book_dict)
-            print(f"DEBUG: Status update success: {update_success}")
-            
-            log_simple(book_id, f"Audio jobs still processing ({completed_count}/{total_jobs})", 'INFO', 'audio_still_processing')
-            print(f"Audio jobs still processing - will check again next run")
-            return False
+                log_simple(book_id, f"All audio jobs completed ({completed_count}/{total_jobs})", 'INFO', 'audio_complete')
+                print(f"All audio jobs completed - ready for next stage")
+                return True
+            else:
+                # Keep as processing
+                _debug(f"Jobs still processing, keeping status as 'processing'")
+                book_dict['audio_generation_status'] = 'processing'
+                update_success = update_book_record(book_dict)
+                _debug(f"Status update success: {update_success}")
+            
+                log_simple(book_id, f"Audio jobs still processing ({completed_count}/{total_jobs})", 'INFO', 'audio_still_processing')
+                print(f"Audio jobs still processing - will check again next run")
+                return False
             
     except Exception as e:
-        print(f"DEBUG: Exception occurred: {e}")
+        _debug(f"Exception occurred: {e}")
         import traceback
         traceback.print_exc()
         log_simple(book_id, f"Error checking audio jobs: {e}", 'ERROR', 'audio_check_error')
@@ -363,6 +382,41 @@ def check_audio_jobs_completion(book_dict: Dict) -> bool:
 # STEP 6: MOVE AUDIO FILES TO PROCESSING DIRECTORY
 ################################################################################
 
+def _copytree_parallel(source_dir: Path, dest_dir: Path) -> int:
+    """Copy a directory tree, running the file copies on COPY_WORKERS threads.
+    
+    The source is walked once, creating the directories in order; each file
+    copy is handed to the pool so several are in flight at once instead of
+    the disk idling between small sequential copies. Directory metadata is
+    copied only after every file copy has finished.
+    
+    Returns:
+        Number of files copied.
+    """
+    import shutil
+    
+    dest_dir.mkdir(parents=True)
+    directories = []
+    copies = []
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+        for root, _, files in os.walk(source_dir, followlinks=True):
+            target = dest_dir / Path(root).relative_to(source_dir)
+            target.mkdir(exist_ok=True)
+            directories.append((root, target))
+            for name in files:
+                copies.append(pool.submit(shutil.copy2, os.path.join(root, name), target / name))
+    
+    # Leaving the pool waited for every copy; surface the first failure
+    for copy in copies:
+        copy.result()
+    
+    # Writing a file into a directory updates its mtime, so directory stats
+    # are copied last, deepest first
+    for root, target in reversed(directories):
+        shutil.copystat(root, target)
+    return len(copies)
+
+
 def move_audio_files_for_book(book_dict: Dict) -> bool:
     """Move generated audio directory structure from dev/output to foundry/processing."""
     print(f"\nSTEP 6: Moving audio directory to processing directory...")
@@ -409,50 +463,52 @@ def move_audio_files_for_book(book_dict: Dict) -> bool:
     
     # Update status to processing
     book_dict['audio_files_moved_status'] = 'processing'
-    update_book_record(book_dict)
-    log_simple(book_id, f"Starting audio directory move for '{book_title}'", 'INFO', 'audio_move_start')
+    with audiobook_db_transaction():
+        update_book_record(book_dict)
+        log_simple(book_id, f"Starting audio directory move for '{book_title}'", 'INFO', 'audio_move_start')
     
     try:
+        import errno
         import shutil
         
-        # Count total files before move for logging
-        total_files = sum(1 for f in source_dir.rglob('*') if f.is_file())
-        
         print(f"Moving entire directory structure with all subdirectories...")
-        print(f"  Estimated files to move: {total_files}")
-        
-        # Copy entire directory structure (preserves all subdirectories)
-        shutil.copytree(str(source_dir), str(dest_dir))
-        print(f"Directory structure copied successfully")
-        
-        # Verify the copy worked by checking if destination exists and has content
-        if not dest_dir.exists():
-            raise Exception("Destination directory not created")
-        
-        # Count files in destination to verify
-        dest_files = sum(1 for f in dest_dir.rglob('*') if f.is_file())
         
-        print(f"Verified destination has content")
-        
-        # Remove source directory after successful copy (completing the "move")
-        print(f"Removing source directory after successful copy...")
-        shutil.rmtree(str(source_dir))
-        print(f"Source directory removed")
+        # Same volume: a single directory rename moves everything at once
+        dest_dir.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.rename(str(source_dir), str(dest_dir))
+            print(f"Directory renamed into place")
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            
+            # Different volume: copy the tree, then remove the source
+            print(f"  Source is on another volume, copying files")
+            
+            # Copy entire directory structure (preserves all subdirectories);
+            # the copy raises if any file fails, so no re-walk is needed
+            copied_files = _copytree_parallel(source_dir, dest_dir)
+            print(f"Directory structure copied successfully ({copied_files} files)")
+            
+            # Remove source directory after successful copy (completing the "move")
+            print(f"Removing source directory after successful copy...")
+            shutil.rmtree(str(source_dir))
+            print(f"Source directory removed")
         
         # Mark as completed
         book_dict['audio_files_moved_status'] = 'completed'
         book_dict['audio_files_moved_completed_at'] = datetime.now().isoformat()
-        update_book_record(book_dict)
-        
-        log_simple(book_id, f"Audio directory moved successfully with all subdirectories", 'INFO', 'audio_move_complete')
+        with audiobook_db_transaction():
+            update_book_record(book_dict)
+            log_simple(book_id, f"Audio directory moved successfully with all subdirectories", 'INFO', 'audio_move_complete')
         print(f"Audio directory moved successfully - ready for next stage")
         return True
             
     except Exception as e:
         book_dict['audio_files_moved_status'] = 'failed'
-        update_book_record(book_dict)
-        
-        log_simple(book_id, f"Audio directory move error: {e}", 'ERROR', 'audio_move_error')
+        with audiobook_db_transaction():
+            update_book_record(book_dict)
+            log_simple(book_id, f"Audio directory move error: {e}", 'ERROR', 'audio_move_error')
         print(f"Audio directory move error: {e}")
         return False
 
@@ -461,6 +517,32 @@ def move_audio_files_for_book(book_dict: Dict) -> bool:
 # STEP 7: PLAN AUDIO COMBINATIONS
 ################################################################################
 
+def _probe_audio_duration(audio_file: Path) -> Optional[float]:
+    """Return the duration of an audio file in seconds (None if unknown).
+    
+    Reads the header with soundfile when possible and falls back to an
+    ffprobe subprocess for formats or installs soundfile can't handle.
+    """
+    if soundfile is not None:
+        try:
+            return soundfile.info(str(audio_file)).duration
+        except Exception:
+            pass  # Unsupported by this libsndfile build; ask ffprobe
+    
+    import subprocess
+    try:
+        result = subprocess.run([
+            'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
+            '-of', 'csv=p=0', str(audio_file)
+        ], capture_output=True, text=True, timeout=30)
+        
+        if result.returncode == 0:
+            return float(result.stdout.strip())
+    except Exception as e:
+        print(f"    Warning: Could not get duration for {audio_file}: {e}")
+    return None
+
+
 def plan_audio_combinations_for_book(book_dict: Dict) -> bool:
     """Analyze audio files and create optimal combination plan within YouTube limits."""
     print(f"\nSTEP 7: Planning audio combinations...")
@@ -488,12 +570,12 @@ def plan_audio_combinations_for_book(book_dict: Dict) -> bool:
     
     # Update status to processing
     book_dict['audio_combination_planned_status'] = 'processing'
-    update_book_record(book_dict)
-    log_simple(book_id, f"Starting audio combination planning for '{book_title}'", 'INFO', 'combination_plan_start')
+    with audiobook_db_transaction():
+        update_book_record(book_dict)
+        log_simple(book_id, f"Starting audio combination planning for '{book_title}'", 'INFO', 'combination_plan_start')
     
     try:
         import json
-        import subprocess
         from math import ceil
         
         # Load existing metadata
@@ -502,9 +584,9 @@ def plan_audio_combinations_for_book(book_dict: Dict) -> bool:
         
         print(f"Analyzing audio durations for {metadata['total_chapters']} chapters...")
         
-        # Analyze each chapter's audio duration
-        chapter_durations = []
-        total_duration_seconds = 0
+        # Find each chapter's audio files first so every file in the book
+        # can be probed concurrently below
+        chapter_audio_files = []
         
         for chapter_info in metadata['chapters']:
             chapter_index = chapter_info['index']
@@ -514,29 +596,63 @@ def plan_audio_combinations_for_book(book_dict: Dict) -> bool:
                 print(f"  Warning: Chapter directory not found: {chapter_dir}")
                 continue
             
-            # Find all audio files in chapter directory
-            audio_files = []
-            for ext in ['.flac', '.wav', '.mp3']:
-                audio_files.extend(chapter_dir.rglob(f"*{ext}"))
+            # Find all audio files in chapter directory with one walk,
+            # grouped by extension
+            files_by_ext = {ext: [] for ext in AUDIO_EXTENSIONS}
+            for path in chapter_dir.rglob('*'):
+                matches = files_by_ext.get(path.suffix.lower())
+                if matches is not None:
+                    matches.append(path)
+            audio_files = [path for ext in AUDIO_EXTENSIONS for path in files_by_ext[ext]]
             
             if not audio_files:
                 print(f"  Warning: No audio files found in {chapter_dir}")
                 continue
             
-            # Get duration of all audio files in this chapter using ffprobe
+            chapter_audio_files.append((chapter_info, audio_files))
+        
+        # Durations measured by earlier runs, keyed by file path; an entry is
+        # reused while the file's mtime and size are unchanged
+        previous_cache = metadata.get('duration_cache', {})
+        duration_cache = {}
+        to_probe = []
+        for _, audio_files in chapter_audio_files:
+            for audio_file in audio_files:
+                key = str(audio_file)
+                st = audio_file.stat()
+                cached = previous_cache.get(key)
+                if (cached and cached.get('mtime_ns') == st.st_mtime_ns
+                        and cached.get('size') == st.st_size):
+                    duration_cache[key] = cached
+                else:
+                    to_probe.append((key, audio_file, st))
+        
+        if previous_cache:
+            print(f"  Reusing cached durations for {len(duration_cache)} files, probing {len(to_probe)}")
+        
+        # Get duration of the remaining audio files; header reads and ffprobe
+        # calls are mostly file I/O and process startup, so run several at once
+        with ThreadPoolExecutor(max_workers=FFPROBE_WORKERS) as pool:
+            probed = pool.map(_probe_audio_duration, [audio_file for _, audio_file, _ in to_probe])
+            for (key, _, st), duration in zip(to_probe, probed):
+                if duration is not None:
+                    duration_cache[key] = {
+                        'mtime_ns': st.st_mtime_ns,
+                        'size': st.st_size,
+                        'duration': duration
+                    }
+        
+        # Analyze each chapter's audio duration
+        chapter_durations = []
+        total_duration_seconds = 0
+        
+        for chapter_info, audio_files in chapter_audio_files:
+            chapter_index = chapter_info['index']
             chapter_duration = 0
             for audio_file in audio_files:
-                try:
-                    result = subprocess.run([
-                        'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-                        '-of', 'csv=p=0', str(audio_file)
-                    ], capture_output=True, text=True, timeout=30)
-                    
-                    if result.returncode == 0:
-                        duration = float(result.stdout.strip())
-                        chapter_duration += duration
-                except Exception as e:
-                    print(f"    Warning: Could not get duration for {audio_file}: {e}")
+                cached = duration_cache.get(str(audio_file))
+                if cached is not None:
+                    chapter_duration += cached['duration']
             
             chapter_durations.append({
                 'chapter': chapter_index,
@@ -630,7 +746,8 @@ def plan_audio_combinations_for_book(book_dict: Dict) -> bool:
             print(f"  Part {combo['part']}: Chapters {combo['chapter_range']} "
                   f"({combo['duration_hours']:.2f} hours)")
         
-        # Add combination plan to metadata
+        # Add combination plan and the per-file durations behind it to metadata
+        metadata['duration_cache'] = duration_cache
         metadata['audio_combination_plan'] = {
             'analysis_completed_at': datetime.now().isoformat(),
             'total_duration_seconds': total_duration_seconds,
@@ -650,17 +767,17 @@ def plan_audio_combinations_for_book(book_dict: Dict) -> bool:
         # Mark as completed
         book_dict['audio_combination_planned_status'] = 'completed'
         book_dict['audio_combination_planned_completed_at'] = datetime.now().isoformat()
-        update_book_record(book_dict)
-        
-        log_simple(book_id, f"Audio combination plan created: {len(combinations)} parts, {total_hours:.2f} hours total", 'INFO', 'combination_plan_complete')
+        with audiobook_db_transaction():
+            update_book_record(book_dict)
+            log_simple(book_id, f"Audio combination plan created: {len(combinations)} parts, {total_hours:.2f} hours total", 'INFO', 'combination_plan_complete')
         print(f"Audio combination plan saved to metadata.json - ready for next stage")
         return True
             
     except Exception as e:
         book_dict['audio_combination_planned_status'] = 'failed'
-        update_book_record(book_dict)
-        
-        log_simple(book_id, f"Audio combination planning error: {e}", 'ERROR', 'combination_plan_error')
+        with audiobook_db_transaction():
+            update_book_record(book_dict)
+            log_simple(book_id, f"Audio combination planning error: {e}", 'ERROR', 'combination_plan_error')
         print(f"Audio combination planning error: {e}")
         import traceback
         traceback.print_exc()
@@ -700,8 +817,9 @@ def generate_subtitles_for_book_pipeline(book_dict: Dict) -> bool:
     
     # Update status to processing
     book_dict['subtitle_generation_status'] = 'processing'
-    update_book_record(book_dict)
-    log_simple(book_id, f"Starting subtitle generation for '{book_title}'", 'INFO', 'subtitle_start')
+    with audiobook_db_transaction():
+        update_book_record(book_dict)
+        log_simple(book_id, f"Starting subtitle generation for '{book_title}'", 'INFO', 'subtitle_start')
     
     try:
         # Import the function we just refactored
@@ -722,9 +840,9 @@ def generate_subtitles_for_book_pipeline(book_dict: Dict) -> bool:
             # Mark as completed
             book_dict['subtitle_generation_status'] = 'completed'
             book_dict['subtitle_generation_completed_at'] = datetime.now().isoformat()
-            update_book_record(book_dict)
-            
-            log_simple(book_id, f"Subtitles generated: {result['total_subtitles']} subtitles, {result['total_duration']:.1f}s", 'INFO', 'subtitle_complete')
+            with audiobook_db_transaction():
+                update_book_record(book_dict)
+                log_simple(book_id, f"Subtitles generated: {result['total_subtitles']} subtitles, {result['total_duration']:.1f}s", 'INFO', 'subtitle_complete')
             print(f"Subtitles generated successfully!")
             print(f"   Total subtitles: {result['total_subtitles']}")
             print(f"   Duration: {result['total_duration']:.1f}s")
@@ -732,17 +850,17 @@ def generate_subtitles_for_book_pipeline(book_dict: Dict) -> bool:
             return True
         else:
             book_dict['subtitle_generation_status'] = 'failed'
-            update_book_record(book_dict)
-            
-            log_simple(book_id, f"Subtitle generation failed: {result.get('error', 'Unknown error')}", 'ERROR', 'subtitle_failed')
+            with audiobook_db_transaction():
+                update_book_record(book_dict)
+                log_simple(book_id, f"Subtitle generation failed: {result.get('error', 'Unknown error')}", 'ERROR', 'subtitle_failed')
             print(f"Subtitle generation failed: {result.get('error', 'Unknown error')}")
             return False
             
     except Exception as e:
         book_dict['subtitle_generation_status'] = 'failed'
-        update_book_record(book_dict)
-        
-        log_simple(book_id, f"Subtitle generation error: {e}", 'ERROR', 'subtitle_error')
+        with audiobook_db_transaction():
+            update_book_record(book_dict)
+            log_simple(book_id, f"Subtitle generation error: {e}", 'ERROR', 'subtitle_error')
         print(f"Subtitle generation error: {e}")
         import traceback
         traceback.print_exc()
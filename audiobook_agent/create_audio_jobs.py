@@ -1,34 +1,135 @@
-import json
+import errno
+import hashlib
 import yaml
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
+import logging
 import os
 import shutil
 import sys
 
+# libyaml-backed dumper when available (same YAML, much faster emission)
+try:
+    from yaml import CSafeDumper as _SafeDumper
+except ImportError:
+    from yaml import SafeDumper as _SafeDumper
+
+# orjson parses the chapter JSON several times faster; both accept bytes
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    import json
+    from json import loads as _json_loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
 # Path configurations - where ComfyUI agent looks for new jobs
 JOBS_PROCESSING_PATH = "comfyui_jobs/processing"  # Base path where agent monitors
 AUDIO_JOBS_DIR = os.path.join(JOBS_PROCESSING_PATH, "speech")  # Subfolder for audio jobs
 FINISHED_AUDIO_PATH = "comfyui_jobs/finished/speech"  # Where finished audio files will be saved
+AUDIO_MANIFEST_DIR = "comfyui_jobs/manifests/speech"  # Job digest manifests, outside the monitored tree
+
+# Reference voice sample passed to every speech job
+_AUDIO_SAMPLE = r"D:\Projects\pheonix\prod\E3\E3\audio_samples\toireland_shelley_cf_128kb.mp3"
+
+logger = logging.getLogger(__name__)
+
+# Directories already created by this process (inherited by forked workers)
+_DIRS_ENSURED = set()
+
+def _ensure_dir(path):
+    """Create a directory once per process instead of once per chapter"""
+    if path not in _DIRS_ENSURED:
+        os.makedirs(path, exist_ok=True)
+        _DIRS_ENSURED.add(path)
 
-def create_audio_jobs(chapter_key, sentences, chapter_title, timestamp, output_dir=AUDIO_JOBS_DIR):
+def _write_file(filepath, data):
+    """Write bytes to a file with a single open/write/close
+    
+    Bypasses the buffered/text file object layers, which only add
+    syscalls for a small file written in one piece.
+    """
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def _job_digest(job_config):
+    """Short content hash of a job config, used to detect unchanged jobs"""
+    return hashlib.blake2b(repr(job_config).encode('utf-8'), digest_size=16).hexdigest()
+
+def _load_manifest(manifest_path):
+    """Read a chapter's filename -> job digest manifest ({} if missing or unreadable)"""
+    try:
+        with open(manifest_path, "rb") as f:
+            manifest = _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+def _chapter_sort_key(chapter_key):
+    """Order "chapter_2" before "chapter_10"; keys without a number go last"""
+    suffix = chapter_key.rsplit("_", 1)[-1]
+    if suffix.isdigit():
+        return (0, int(suffix), chapter_key)
+    return (1, 0, chapter_key)
+
+def create_audio_jobs(chapter_key, sentences, chapter_title, timestamp, output_dir=AUDIO_JOBS_DIR,
+                      manifest_dir=AUDIO_MANIFEST_DIR):
     """Create individual YAML configs for each sentence
     
+    Jobs whose config is unchanged since the last run and whose YAML file
+    is still present are skipped, based on a per-chapter manifest of job
+    digests. Manifests live outside the folder the ComfyUI agent monitors.
+    
     Args:
         chapter_key: Chapter identifier
         sentences: List of sentences
         chapter_title: Title of the chapter
         timestamp: Timestamp to use in filenames (from input file)
         output_dir: Output directory for YAML files
+        manifest_dir: Directory for the per-chapter job digest manifests
     """
     
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+    # Create output directories if they don't exist
+    _ensure_dir(output_dir)
+    _ensure_dir(manifest_dir)
     
     created_files = []
     
     # Extract chapter number from chapter_key (e.g., "chapter_1" -> "1")
     chapter_num = chapter_key.split("_")[1] if "_" in chapter_key else "1"
     
+    # Fields shared by every sentence job in this chapter; each job copies
+    # these and adds its own sentence-specific entries
+    base_inputs = {"6_audio": _AUDIO_SAMPLE}
+    base_metadata = {
+        "chapter": chapter_key,
+        "title": chapter_title,
+        "total_sentences": len(sentences),
+        "creator": "Novel to Audio Converter",
+        "version": "1.0"
+    }
+    
+    # Digests of the jobs written by previous runs for this chapter; one
+    # manifest per chapter so parallel chapter workers never share a file
+    manifest_path = os.path.join(manifest_dir, f"manifest_{timestamp}_{chapter_num}.json")
+    manifest = _load_manifest(manifest_path)
+    manifest_changed = False
+    skipped = 0
+    
+    # Per-sentence names differ only in the sentence number, so the
+    # chapter-invariant parts are formatted once ('%' escaped for %-format)
+    key, ts, num = (s.replace("%", "%%") for s in (chapter_key, timestamp, chapter_num))
+    filename_tpl = f"SPEECH_{ts}_{num}_s%04d.yaml"
+    prefix_tpl = f"speech/{ts}/{num}/s%04d/audio"
+    file_path_tpl = f"{FINISHED_AUDIO_PATH}/{key}_{ts}_s%04d.wav"
+    
     # Create one job per sentence
     for idx, sentence in enumerate(sentences, 1):
         # Skip empty sentences
@@ -37,7 +138,7 @@ def create_audio_jobs(chapter_key, sentences, chapter_title, timestamp, output_d
             
         # Filename format: TYPE_TIMESTAMP_INDEX_jobname.yaml
         # where INDEX is the chapter number, jobname includes sentence number
-        filename = f"SPEECH_{timestamp}_{chapter_num}_s{idx:04d}.yaml"
+        filename = filename_tpl % idx
         
         # Create job configuration for single sentence
         job_config = {
@@ -45,33 +146,41 @@ def create_audio_jobs(chapter_key, sentences, chapter_title, timestamp, output_d
             "workflow_id": "T2S_chatterbox_v1", 
             "priority": 5,
             "inputs": {
+                **base_inputs,
                 "10_text": sentence,
-                "6_audio": "D:\\Projects\\pheonix\\prod\\E3\\E3\\audio_samples\\toireland_shelley_cf_128kb.mp3",
-                "9_filename_prefix" : f"speech/{timestamp}/{chapter_num}/s{idx:04d}/audio"
+                "9_filename_prefix" : prefix_tpl % idx
             },
             "outputs": {
-                "file_path": f"{FINISHED_AUDIO_PATH}/{chapter_key}_{timestamp}_s{idx:04d}.wav"
+                "file_path": file_path_tpl % idx
             },
-            "metadata": {
-                "chapter": chapter_key,
-                "title": chapter_title,
-                "sentence_index": idx,
-                "total_sentences": len(sentences),
-                "creator": "Novel to Audio Converter",
-                "version": "1.0"
-            }
+            "metadata": {**base_metadata, "sentence_index": idx}
         }
         
-        # Save YAML file with UTF-8 encoding to handle special characters
+        # Skip jobs already written with identical content
         filepath = os.path.join(output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            # allow_unicode=True ensures special characters are preserved
-            yaml.dump(job_config, f, default_flow_style=False, allow_unicode=True)
+        digest = _job_digest(job_config)
+        if manifest.get(filename) == digest and os.path.exists(filepath):
+            skipped += 1
+            continue
+        
+        # Save YAML file with UTF-8 encoding to handle special characters;
+        # allow_unicode=True ensures special characters are preserved
+        data = yaml.dump(job_config, Dumper=_SafeDumper, default_flow_style=False,
+                         allow_unicode=True).encode('utf-8')
+        _write_file(filepath, data)
+        manifest[filename] = digest
+        manifest_changed = True
         
         created_files.append(filepath)
-        print(f"Created: {filepath}")
+        # Per-file detail only at debug level; the chapter summary is printed below
+        logger.debug("Created: %s", filepath)
+    
+    if manifest_changed:
+        _write_file(manifest_path, _json_dumps(manifest))
     
     print(f"\nTotal files created: {len(created_files)}")
+    if skipped:
+        print(f"Unchanged files skipped: {skipped}")
     print(f"Files location: {output_dir}")
     print(f"Audio outputs will be saved to: {FINISHED_AUDIO_PATH}")
     return created_files
@@ -85,30 +194,39 @@ def main():
     print(f"Using timestamp from input file: {timestamp}")
     
     # Read parsed chapters
-    with open(input_filename, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(input_filename, "rb") as f:
+        data = _json_loads(f.read())
     
     # Get total chapters
     total_chapters = len(data["chapter_sentences"])
     print(f"\nFound {total_chapters} chapters to process")
     
-    # Process ALL chapters
-    for chapter_key in sorted(data["chapter_sentences"].keys()):
-        if chapter_key in data["chapter_sentences"]:
-            sentences = data["chapter_sentences"][chapter_key]
-            title = data["chapter_titles"][chapter_key]
-            
+    # Process ALL chapters; chapters write disjoint files, so YAML emission
+    # is spread over one worker process per core
+    sentences_by_chapter = data["chapter_sentences"]
+    titles_by_chapter = data["chapter_titles"]
+    chapter_keys = sorted(sentences_by_chapter, key=_chapter_sort_key)
+    chapter_sentences = [sentences_by_chapter[key] for key in chapter_keys]
+    chapter_titles = [titles_by_chapter.get(key, "") for key in chapter_keys]
+    
+    # Create the jobs and manifest folders before the workers start so they skip them
+    _ensure_dir(AUDIO_JOBS_DIR)
+    _ensure_dir(AUDIO_MANIFEST_DIR)
+    
+    with ProcessPoolExecutor() as pool:
+        results = pool.map(
+            create_audio_jobs,
+            chapter_keys,
+            chapter_sentences,
+            chapter_titles,
+            repeat(timestamp)
+        )
+        for chapter_key, title, sentences, created_files in zip(
+                chapter_keys, chapter_titles, chapter_sentences, results):
             print(f"\n{'='*60}")
-            print(f"Processing {chapter_key}: {title}")
-            print(f"Sentences to process: {len(sentences)}")
+            print(f"Processed {chapter_key}: {title}")
+            print(f"Sentences: {len(sentences)}, files created: {len(created_files)}")
             print(f"{'='*60}")
-            
-            create_audio_jobs(
-                chapter_key,
-                sentences,
-                title,
-                timestamp
-            )
     
     print(f"\n{'='*60}")
     print(f"ALL CHAPTERS PROCESSED!")
@@ -127,27 +245,37 @@ def cleanup_processed_files():
     
     moved_count = 0
     
-    # Check if processing directory exists
-    if os.path.exists(AUDIO_JOBS_DIR):
-        # List all YAML files in processing
-        yaml_files = [f for f in os.listdir(AUDIO_JOBS_DIR) if f.endswith('.yaml')]
-        
+    # List all YAML files in processing; scandir entries carry the file
+    # type and full path, so no extra stat or join per entry. A missing
+    # processing folder simply means there is nothing to move.
+    try:
+        with os.scandir(AUDIO_JOBS_DIR) as it:
+            yaml_files = [entry for entry in it
+                          if entry.name.endswith('.yaml') and entry.is_file()]
+    except FileNotFoundError:
+        yaml_files = None
+    
+    if yaml_files is not None:
         print(f"Found {len(yaml_files)} YAML files in processing folder")
         
-        for filename in yaml_files:
-            src_path = os.path.join(AUDIO_JOBS_DIR, filename)
+        for entry in yaml_files:
+            filename = entry.name
+            src_path = entry.path
             dst_path = os.path.join(FINISHED_AUDIO_PATH, filename)
             
             try:
-                # Move file (this removes it from source)
-                shutil.move(src_path, dst_path)
+                # Move file (this removes it from source); a rename is a single
+                # syscall and overwrites an existing duplicate atomically
+                try:
+                    os.replace(src_path, dst_path)
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+                    # Finished folder is on another filesystem: copy, then remove
+                    shutil.copy2(src_path, dst_path)
+                    os.unlink(src_path)
                 moved_count += 1
                 print(f"Moved: {filename}")
-            except FileExistsError:
-                # If file already exists in destination, just remove from source
-                os.remove(src_path)
-                moved_count += 1
-                print(f"Removed duplicate: {filename}")
             except Exception as e:
                 print(f"Error moving {filename}: {e}")
     
@@ -0,0 +1,296 @@
+"""
+SQLite connection pool for ComfyUI Agent.
+
+Keeps one read-write connection and a set of read-only connections open
+for the lifetime of the process, so request handlers reuse warmed page
+caches instead of opening and configuring the database on every call.
+"""
+
+import functools
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+
+# Number of read-only connections kept per database
+DEFAULT_READERS = min(os.cpu_count() or 1, 8)
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+# How long SQLite waits on a lock held by another process before giving up
+BUSY_TIMEOUT_MS = 30000
+
+# Page cache per connection (negative PRAGMA value means KiB, ~20 MB here)
+CACHE_SIZE_KIB = 20000
+
+# Memory-mapped I/O window; reads within it skip the read() syscall copy
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+
+# Connections unused for this long are closed and reopened on next checkout,
+# releasing their page cache and mmap window while the dashboard is idle
+IDLE_TIMEOUT_SECONDS = 300.0
+
+# Retries for writes that still fail with "database is locked"
+WRITE_RETRIES = 5
+WRITE_RETRY_DELAY_SECONDS = 0.01
+
+T = TypeVar("T")
+
+# (st_dev, st_ino) of a database file; None when the file does not exist
+FileId = Optional[Tuple[int, int]]
+
+
+def _file_id(db_path: str) -> FileId:
+    """Identify the file currently at ``db_path``.
+
+    Args:
+        db_path: Path to SQLite database file.
+
+    Returns:
+        Device and inode numbers, or None if the file is missing.
+    """
+    try:
+        stat = os.stat(db_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def _configure_connection(conn: sqlite3.Connection) -> None:
+    """Apply per-connection settings once when the connection is opened.
+
+    Args:
+        conn: Freshly opened SQLite connection.
+    """
+    conn.row_factory = sqlite3.Row  # Enable column access by name
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+
+
+class SQLitePool:
+    """Pool holding a single writer and several read-only connections.
+
+    Writers are serialized through a lock; readers are handed out from a
+    thread-safe queue and block until one is returned. Connections are
+    shared across threads, so they are opened with check_same_thread=False.
+
+    Each connection remembers the device/inode of the file it opened. On
+    checkout it is reopened if the file at db_path is now a different file
+    or missing (an open connection keeps reading a deleted file, so a
+    recreated database would otherwise go unnoticed), if it was closed, or
+    if it sat idle for longer than IDLE_TIMEOUT_SECONDS.
+    """
+
+    def __init__(self, db_path: str, readers: int = DEFAULT_READERS) -> None:
+        """Open the writer and reader connections.
+
+        Args:
+            db_path: Path to SQLite database file.
+            readers: Number of read-only connections to open.
+        """
+        self.db_path = db_path
+        self._read_uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+        self._write_lock = threading.Lock()
+
+        # Writer first: switching to WAL lets readers run alongside it
+        self._writer, self._writer_file_id = self._open(self._open_writer)
+        self._writer_last_used = time.monotonic()
+
+        # Readers are queued with their file identity and the time they
+        # were last returned
+        self._readers: "queue.Queue[Tuple[sqlite3.Connection, FileId, float]]" = queue.Queue()
+        for _ in range(max(1, readers)):
+            self._readers.put((*self._open(self._open_reader), time.monotonic()))
+
+    def _open_writer(self) -> sqlite3.Connection:
+        """Open and configure the read-write connection.
+
+        Implicit transactions start with BEGIN IMMEDIATE, taking the write
+        lock up front (waiting up to busy_timeout) instead of failing with
+        SQLITE_BUSY when a deferred transaction later tries to upgrade.
+        """
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE,
+            isolation_level="IMMEDIATE"
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        _configure_connection(conn)
+        return conn
+
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open and configure a read-only connection."""
+        conn = sqlite3.connect(
+            self._read_uri, uri=True, check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        _configure_connection(conn)
+        return conn
+
+    def _open(self, opener: Callable[[], sqlite3.Connection]) -> Tuple[sqlite3.Connection, FileId]:
+        """Open a connection along with the identity of the file it opens.
+
+        The file is identified before connecting: if it is replaced in
+        between, the recorded identity is the stale one and the next
+        checkout reopens, rather than trusting a connection to an old file.
+        """
+        file_id = _file_id(self.db_path)
+        return opener(), file_id
+
+    def _checkout(self, conn: sqlite3.Connection, file_id: FileId, last_used: float,
+                  reopen: Callable[[], sqlite3.Connection]) -> Tuple[sqlite3.Connection, FileId]:
+        """Return ``conn`` if it is fresh and still open on db_path, else a reopened one."""
+        if (time.monotonic() - last_used <= IDLE_TIMEOUT_SECONDS
+                and file_id is not None and file_id == _file_id(self.db_path)):
+            try:
+                conn.in_transaction  # Raises without touching the database once closed
+                return conn, file_id
+            except sqlite3.ProgrammingError:
+                pass
+        conn.close()
+        return self._open(reopen)
+
+    @contextmanager
+    def acquire_read(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection.
+
+        Yields:
+            Read-only database connection.
+        """
+        conn, file_id, last_used = self._readers.get()
+        try:
+            conn, file_id = self._checkout(conn, file_id, last_used, self._open_reader)
+        except Exception:
+            # Keep the pool size stable; the next checkout retries the reopen
+            self._readers.put((conn, None, 0.0))
+            raise
+        try:
+            yield conn
+        finally:
+            self._readers.put((conn, file_id, time.monotonic()))
+
+    @contextmanager
+    def acquire_write(self) -> Iterator[sqlite3.Connection]:
+        """Borrow the writer connection, committing on success.
+
+        Yields:
+            Read-write database connection.
+        """
+        with self._write_lock:
+            self._writer, self._writer_file_id = self._checkout(
+                self._writer, self._writer_file_id, self._writer_last_used, self._open_writer
+            )
+            try:
+                yield self._writer
+                self._writer.commit()
+            except Exception:
+                self._writer.rollback()
+                raise
+            finally:
+                self._writer_last_used = time.monotonic()
+
+    def close(self) -> None:
+        """Close every connection held by the pool."""
+        with self._write_lock:
+            self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait()[0].close()
+
+
+_pools: Dict[str, SQLitePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> SQLitePool:
+    """Get the pool for a database, creating it on first use.
+
+    Args:
+        db_path: Path to SQLite database file.
+
+    Returns:
+        Connection pool for the database.
+    """
+    pool = _pools.get(db_path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(db_path)
+            if pool is None:
+                pool = _pools[db_path] = SQLitePool(db_path)
+    return pool
+
+
+@contextmanager
+def acquire_read(db_path: str) -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled read-only connection for a database.
+
+    Args:
+        db_path: Path to SQLite database file.
+
+    Yields:
+        Read-only database connection.
+
+    Examples:
+        >>> with acquire_read("db.sqlite") as conn:
+        ...     rows = conn.execute("SELECT * FROM comfyui_jobs").fetchall()
+    """
+    with get_pool(db_path).acquire_read() as conn:
+        yield conn
+
+
+@contextmanager
+def acquire_write(db_path: str) -> Iterator[sqlite3.Connection]:
+    """Borrow the pooled writer connection for a database.
+
+    Commits when the block exits normally and rolls back on error.
+
+    Args:
+        db_path: Path to SQLite database file.
+
+    Yields:
+        Read-write database connection.
+    """
+    with get_pool(db_path).acquire_write() as conn:
+        yield conn
+
+
+def retry_if_locked(func: Callable[..., T]) -> Callable[..., T]:
+    """Retry a write helper when SQLite reports the database is locked.
+
+    Several server processes (or the executor and monitor) may write to the
+    same database. busy_timeout covers most contention, but lock upgrades
+    can still fail immediately, so the whole helper is re-run a few times
+    with a short sleep in between.
+
+    Args:
+        func: Function that performs its writes via acquire_write().
+
+    Returns:
+        Wrapped function.
+    """
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        for attempt in range(WRITE_RETRIES):
+            try:
+                return func(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) or attempt == WRITE_RETRIES - 1:
+                    raise
+                time.sleep(WRITE_RETRY_DELAY_SECONDS)
+        raise AssertionError("unreachable")
+    return wrapper
+
+
+def close_pools() -> None:
+    """Close all pools, e.g. on server shutdown."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
@@ -9,6 +9,11 @@ from typing import Any, Optional
 from comfyui_agent.db_manager import get_db_connection
 
 
+# Valid priority range (lower number = higher priority)
+MIN_PRIORITY = 1
+MAX_PRIORITY = 999
+
+
 def should_run_next(current_busy: bool) -> bool:
     """Determine if next job should be executed.
     
@@ -43,6 +48,22 @@ def apply_god_mode(db_path: str, config_name: str) -> None:
     set_job_priority(db_path, config_name, 1)
 
 
+def clamp_priority(priority: int) -> int:
+    """Clamp a priority value to the valid range (1-999).
+    
+    Args:
+        priority: Requested priority value.
+        
+    Returns:
+        Priority clamped to MIN_PRIORITY..MAX_PRIORITY.
+        
+    Examples:
+        >>> clamp_priority(1500)
+        999
+    """
+    return max(MIN_PRIORITY, min(MAX_PRIORITY, priority))
+
+
 def set_job_priority(db_path: str, config_name: str, priority: Any) -> None:
     """Set priority for a specific job.
     
@@ -65,7 +86,7 @@ def set_job_priority(db_path: str, config_name: str, priority: Any) -> None:
         raise ValueError("Priority must be an integer")
     
     # Clamp priority to valid range
-    priority = max(1, min(999, priority))
+    priority = clamp_priority(priority)
     
     with get_db_connection(db_path) as conn:
         cursor = conn.cursor()
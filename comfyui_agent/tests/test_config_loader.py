@@ -125,6 +125,33 @@ class TestLoadGlobalConfig:
         with pytest.raises(ValueError, match="Config file not found"):
             load_global_config("/nonexistent/path/config.yaml")
 
+    def test_referenced_env_var_change_reloads_config(self, tmp_path: Path, monkeypatch) -> None:
+        """Test that a cached config is re-interpolated when a ${VAR} it uses changes."""
+        from comfyui_agent.utils.config_loader import clear_config_cache
+
+        # Arrange
+        (tmp_path / "config").mkdir()
+        (tmp_path / "config" / "global_test.yaml").write_text(yaml.dump({
+            "databases": {"main": "database/test.db"},
+            "paths": {"jobs_processing": "jobs/processing", "jobs_finished": "jobs/finished"},
+            "comfyui": {"api_base_url": "http://${E3_TEST_HOST:-127.0.0.1}:8188"}
+        }))
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("E3_ENV", "test")
+        monkeypatch.setenv("E3_TEST_HOST", "first")
+        clear_config_cache()
+        first = load_global_config()
+
+        # Act
+        again = load_global_config()
+        monkeypatch.setenv("E3_TEST_HOST", "second")
+        changed = load_global_config()
+
+        # Assert
+        assert again is first
+        assert first["comfyui"]["api_base_url"] == "http://first:8188"
+        assert changed["comfyui"]["api_base_url"] == "http://second:8188"
+
 
 class TestLoadWorkflows:
     """Tests for load_workflows function."""
@@ -212,4 +239,111 @@ class TestLoadWorkflows:
         """Test that a nonexistent file raises ValueError."""
         # Act & Assert
         with pytest.raises(ValueError, match="Workflows file not found"):
-            load_workflows("/nonexistent/workflows.yaml")
\ No newline at end of file
+            load_workflows("/nonexistent/workflows.yaml")
+
+    def test_reuses_parsed_workflows_until_file_changes(self, tmp_path: Path) -> None:
+        """Test that an unchanged file is served from cache and edits are picked up."""
+        # Arrange
+        workflows_file = tmp_path / "workflows.yaml"
+        workflows_file.write_text(yaml.dump({"wf_a": {"template_path": "a.json", "required_inputs": []}}))
+        first = load_workflows(str(workflows_file))
+
+        # Act
+        again = load_workflows(str(workflows_file))
+        workflows_file.write_text(yaml.dump({"wf_bb": {"template_path": "bb.json", "required_inputs": []}}))
+        changed = load_workflows(str(workflows_file))
+
+        # Assert
+        assert again is first
+        assert list(changed) == ["wf_bb"]
+
+    def test_serves_last_load_while_file_is_missing(self, tmp_path: Path) -> None:
+        """Test that a loaded file which disappears serves its last result within the grace period."""
+        # Arrange
+        workflows_file = tmp_path / "workflows.yaml"
+        workflows_file.write_text(yaml.dump({"wf_a": {"template_path": "a.json", "required_inputs": []}}))
+        first = load_workflows(str(workflows_file))
+        workflows_file.unlink()
+
+        # Act
+        stale = load_workflows(str(workflows_file))
+
+        # Assert
+        assert stale is first
+
+    def test_missing_file_reported_after_grace_period(self, tmp_path: Path, monkeypatch) -> None:
+        """Test that a file missing for longer than the grace period raises again."""
+        # Arrange
+        workflows_file = tmp_path / "workflows.yaml"
+        workflows_file.write_text(yaml.dump({"wf_a": {"template_path": "a.json", "required_inputs": []}}))
+        first = load_workflows(str(workflows_file))
+        workflows_file.unlink()
+        stale = load_workflows(str(workflows_file))
+
+        # Act
+        monkeypatch.setattr("comfyui_agent.utils.config_loader.WORKFLOWS_MISSING_GRACE_SECONDS", -1.0)
+
+        # Assert
+        assert stale is first
+        with pytest.raises(ValueError, match="Workflows file not found"):
+            load_workflows(str(workflows_file))
+
+
+class TestLoadEnvFile:
+    """Tests for .env loading."""
+
+    def test_sets_missing_variables_and_keeps_existing(self, tmp_path: Path, monkeypatch) -> None:
+        """Test comments, blank lines and precedence of the real environment."""
+        from comfyui_agent.utils.config_loader import clear_config_cache, load_env_file
+
+        # Arrange
+        (tmp_path / ".env").write_text("# comment\n\nE3_TEST_NEW = from_file\nE3_TEST_SET=from_file\nnoequals\n")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("E3_TEST_NEW", raising=False)
+        monkeypatch.setenv("E3_TEST_SET", "from_env")
+        clear_config_cache()
+
+        # Act
+        load_env_file()
+
+        # Assert
+        assert os.environ["E3_TEST_NEW"] == "from_file"
+        assert os.environ["E3_TEST_SET"] == "from_env"
+
+
+class TestInterpolateEnvVars:
+    """Tests for ${VAR} interpolation in config values."""
+
+    def test_resolves_variables_defaults_and_leaves_plain_values(self, monkeypatch) -> None:
+        """Test set, unset and defaulted variables alongside non-string values."""
+        from comfyui_agent.utils.config_loader import _interpolate_env_vars
+
+        # Arrange
+        monkeypatch.setenv("E3_TEST_ROOT", "/data")
+        monkeypatch.delenv("E3_TEST_UNSET", raising=False)
+        config = {"paths": ["${E3_TEST_ROOT}/jobs", "${E3_TEST_UNSET}", "${E3_TEST_UNSET:-fallback}"],
+                  "plain": "no vars", "count": 3}
+
+        # Act
+        result = _interpolate_env_vars(config)
+
+        # Assert
+        assert result == {"paths": ["/data/jobs", "${E3_TEST_UNSET}", "fallback"],
+                          "plain": "no vars", "count": 3}
+
+    def test_updates_nested_containers_in_place(self, monkeypatch) -> None:
+        """Test that nested dicts and lists are interpolated without being copied."""
+        from comfyui_agent.utils.config_loader import _interpolate_env_vars
+
+        # Arrange
+        monkeypatch.setenv("E3_TEST_HOST", "example")
+        inner = {"url": "http://${E3_TEST_HOST}:8188"}
+        config = {"comfyui": inner, "hosts": [[inner]]}
+
+        # Act
+        result = _interpolate_env_vars(config)
+
+        # Assert
+        assert result is config
+        assert result["comfyui"] is inner
+        assert inner["url"] == "http://example:8188"
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+Tests for SQLite connection pool module.
+"""
+
+import pytest
+import sqlite3
+from pathlib import Path
+
+from comfyui_agent.db_pool import (
+    CACHE_SIZE_KIB, SQLitePool, acquire_read, acquire_write, close_pools, get_pool
+)
+
+
+def _create_table(db_path: str) -> None:
+    """Create a minimal jobs table for pool tests."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE comfyui_jobs (id INTEGER PRIMARY KEY, status TEXT)")
+    conn.commit()
+    conn.close()
+
+
+class TestSQLitePool:
+    """Tests for SQLitePool class."""
+
+    def test_reader_sees_committed_writes(self, tmp_path: Path) -> None:
+        """Test that readers observe rows committed through the writer."""
+        # Arrange
+        db_path = str(tmp_path / "test.db")
+        _create_table(db_path)
+        pool = SQLitePool(db_path, readers=2)
+
+        # Act
+        with pool.acquire_write() as conn:
+            conn.execute("INSERT INTO comfyui_jobs (status) VALUES ('pending')")
+        with pool.acquire_read() as conn:
+            row = conn.execute("SELECT status FROM comfyui_jobs").fetchone()
+
+        # Assert
+        assert row["status"] == "pending"
+        pool.close()
+
+    def test_readers_are_read_only(self, tmp_path: Path) -> None:
+        """Test that reader connections reject writes."""
+        # Arrange
+        db_path = str(tmp_path / "test.db")
+        _create_table(db_path)
+        pool = SQLitePool(db_path, readers=1)
+
+        # Act & Assert
+        with pool.acquire_read() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO comfyui_jobs (status) VALUES ('pending')")
+        pool.close()
+
+    def test_connections_are_tuned(self, tmp_path: Path) -> None:
+        """Test that pooled connections carry the WAL/cache PRAGMAs."""
+        # Arrange
+        db_path = str(tmp_path / "test.db")
+        _create_table(db_path)
+        pool = SQLitePool(db_path, readers=1)
+
+        # Act
+        with pool.acquire_read() as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+            cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+
+        # Assert
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
+        assert cache_size == -CACHE_SIZE_KIB
+        pool.close()
+
+    def test_write_rolls_back_on_error(self, tmp_path: Path) -> None:
+        """Test that a failing write block is rolled back."""
+        # Arrange
+        db_path = str(tmp_path / "test.db")
+        _create_table(db_path)
+        pool = SQLitePool(db_path, readers=1)
+
+        # Act
+        with pytest.raises(RuntimeError):
+            with pool.acquire_write() as conn:
+                conn.execute("INSERT INTO comfyui_jobs (status) VALUES ('pending')")
+                raise RuntimeError("boom")
+
+        # Assert
+        with pool.acquire_read() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM comfyui_jobs").fetchone()[0] == 0
+        pool.close()
+
+    def test_idle_connection_is_reopened(self, tmp_path: Path, monkeypatch) -> None:
+        """Test that connections idle past the timeout are replaced."""
+        # Arrange
+        db_path = str(tmp_path / "test.db")
+        _create_table(db_path)
+        pool = SQLitePool(db_path, readers=1)
+        with pool.acquire_read() as conn:
+            first = conn
+
+        # Act
+        monkeypatch.setattr("comfyui_agent.db_pool.IDLE_TIMEOUT_SECONDS", -1.0)
+        with pool.acquire_read() as conn:
+            second = conn
+            count = conn.execute("SELECT COUNT(*) FROM comfyui_jobs").fetchone()[0]
+
+        # Assert
+        assert second is not first
+        assert count == 0
+        pool.close()
+
+    def test_broken_connection_is_replaced(self, tmp_path: Path) -> None:
+        """Test that a connection failing the checkout ping is reopened."""
+        # Arrange
+        db_path = str(tmp_path / "test.db")
+        _create_table(db_path)
+        pool = SQLitePool(db_path, readers=1)
+        with pool.acquire_read() as conn:
+            conn.close()
+
+        # Act
+        with pool.acquire_read() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM comfyui_jobs").fetchone()[0]
+
+        # Assert
+        assert count == 0
+        pool.close()
+
+    def test_recreated_database_is_reopened(self, tmp_path: Path) -> None:
+        """Test that connections to a deleted database file are replaced."""
+        # Arrange
+        db_path = str(tmp_path / "test.db")
+        _create_table(db_path)
+        pool = SQLitePool(db_path, readers=1)
+        with pool.acquire_write() as conn:
+            conn.execute("INSERT INTO comfyui_jobs (status) VALUES ('old')")
+        with pool.acquire_read() as conn:
+            conn.execute("SELECT status FROM comfyui_jobs").fetchall()
+
+        # Act
+        for suffix in ("", "-wal", "-shm"):
+            Path(db_path + suffix).unlink(missing_ok=True)
+        _create_table(db_path)
+        with pool.acquire_write() as conn:
+            conn.execute("INSERT INTO comfyui_jobs (status) VALUES ('new')")
+        with pool.acquire_read() as conn:
+            statuses = [row["status"] for row in conn.execute("SELECT status FROM comfyui_jobs")]
+
+        # Assert
+        assert statuses == ["new"]
+        pool.close()
+
+    def test_writer_takes_write_lock_up_front(self, tmp_path: Path) -> None:
+        """Test that writer transactions begin IMMEDIATE."""
+        # Arrange
+        db_path = str(tmp_path / "test.db")
+        _create_table(db_path)
+        pool = SQLitePool(db_path, readers=1)
+
+        # Act
+        with pool.acquire_write() as conn:
+            isolation_level = conn.isolation_level
+            conn.execute("INSERT INTO comfyui_jobs (status) VALUES ('pending')")
+            in_transaction = conn.in_transaction
+
+        # Assert
+        assert isolation_level == "IMMEDIATE"
+        assert in_transaction
+        pool.close()
+
+
+class TestModulePools:
+    """Tests for module-level pool helpers."""
+
+    def test_get_pool_reuses_pool_per_path(self, tmp_path: Path) -> None:
+        """Test that the same pool is returned for the same database."""
+        # Arrange
+        db_path = str(tmp_path / "test.db")
+        _create_table(db_path)
+
+        # Act & Assert
+        assert get_pool(db_path) is get_pool(db_path)
+        close_pools()
+
+    def test_acquire_helpers_round_trip(self, tmp_path: Path) -> None:
+        """Test writing and reading through the module-level helpers."""
+        # Arrange
+        db_path = str(tmp_path / "test.db")
+        _create_table(db_path)
+
+        # Act
+        with acquire_write(db_path) as conn:
+            conn.execute("INSERT INTO comfyui_jobs (status) VALUES ('done')")
+        with acquire_read(db_path) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM comfyui_jobs").fetchone()[0]
+
+        # Assert
+        assert count == 1
+        close_pools()
@@ -69,6 +69,27 @@ class TestEnsureDirectories:
         # Assert
         assert os.path.exists(paths["deep"])
 
+    def test_skips_existing_and_parent_paths(self, tmp_path: Path, monkeypatch) -> None:
+        """Test that only missing leaf directories reach os.makedirs."""
+        # Arrange
+        (tmp_path / "existing").mkdir()
+        paths = {
+            "parent": str(tmp_path / "jobs"),
+            "child": str(tmp_path / "jobs" / "processing"),
+            "existing": str(tmp_path / "existing"),
+        }
+        created = []
+        real_makedirs = os.makedirs
+        monkeypatch.setattr(os, "makedirs", lambda p, **kw: created.append(p) or real_makedirs(p, **kw))
+        
+        # Act
+        ensure_directories(paths)
+        
+        # Assert
+        assert created[0] == paths["child"]  # os.makedirs recurses for the parent itself
+        assert paths["existing"] not in created
+        assert os.path.isdir(paths["parent"])
+
     def test_handles_empty_dict(self) -> None:
         """Test that empty dict is handled gracefully."""
         # Act & Assert - should not raise
@@ -148,6 +169,31 @@ class TestListYamlUnder:
         # Assert
         assert len(result) == 1
 
+    def test_unchanged_tree_served_from_cache(self, tmp_path: Path, monkeypatch) -> None:
+        """Test that settled directories are not re-walked until they change."""
+        from comfyui_agent.utils import file_utils
+        
+        # Arrange
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "a.yaml").write_text("test: 1")
+        for directory in (tmp_path / "sub", tmp_path):
+            os.utime(directory, ns=(0, 1_000_000_000))
+        walks = []
+        collect = file_utils._collect_yaml
+        monkeypatch.setattr(file_utils, "_collect_yaml",
+                            lambda *args: walks.append(args[0]) or collect(*args))
+        first = list_yaml_under(str(tmp_path))
+        
+        # Act
+        cached = list_yaml_under(str(tmp_path))
+        (tmp_path / "sub" / "b.yaml").write_text("test: 2")
+        refreshed = list_yaml_under(str(tmp_path))
+        
+        # Assert
+        assert cached == first
+        assert walks.count(str(tmp_path)) == 2  # first call and the call after the change
+        assert sorted(os.path.basename(p) for p in refreshed) == ["a.yaml", "b.yaml"]
+
 
 class TestSafeMove:
     """Tests for safe_move function."""
@@ -222,6 +268,32 @@ class TestSafeMove:
         assert dst.exists()
         assert dst.read_text() == "cross-fs content"
 
+    def test_falls_back_to_copy_when_rename_crosses_devices(self, tmp_path: Path, monkeypatch) -> None:
+        """Test the copy-and-rename path taken when os.replace reports EXDEV."""
+        import errno
+        
+        # Arrange
+        src = tmp_path / "source.txt"
+        dst = tmp_path / "dest" / "destination.txt"
+        src.write_text("content")
+        (tmp_path / "dest").mkdir()
+        real_replace = os.replace
+        
+        def replace(a, b):
+            if a == str(src):
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            real_replace(a, b)
+        
+        monkeypatch.setattr(os, "replace", replace)
+        
+        # Act
+        safe_move(str(src), str(dst))
+        
+        # Assert
+        assert not src.exists()
+        assert dst.read_text() == "content"
+        assert os.listdir(tmp_path / "dest") == ["destination.txt"]
+
     def test_raises_on_nonexistent_source(self, tmp_path: Path) -> None:
         """Test that moving non-existent source raises error."""
         # Arrange
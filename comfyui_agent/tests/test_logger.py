@@ -98,6 +98,35 @@ class TestSetupLogging:
         final_handler_count = len(root_logger.handlers)
         assert final_handler_count <= initial_handler_count + 1
 
+    def test_repeated_setup_with_same_arguments_is_noop(self) -> None:
+        """Test that an identical call leaves handler formatters alone."""
+        # Arrange
+        setup_logging(level="INFO", format="%(message)s")
+        handler = logging.getLogger().handlers[0]
+        formatter = handler.formatter
+        
+        # Act
+        setup_logging(level="INFO", format="%(message)s")
+        
+        # Assert
+        assert handler.formatter is formatter
+
+    def test_repeated_setup_restores_level_and_formatter_changed_elsewhere(self) -> None:
+        """Test that an identical call re-applies settings reset in between."""
+        # Arrange
+        setup_logging(level="INFO", format="%(message)s")
+        root_logger = logging.getLogger()
+        handler = root_logger.handlers[0]
+        root_logger.setLevel(logging.WARNING)
+        handler.setFormatter(logging.Formatter("%(levelname)s"))
+        
+        # Act
+        setup_logging(level="INFO", format="%(message)s")
+        
+        # Assert
+        assert root_logger.level == logging.INFO
+        assert handler.formatter._fmt == "%(message)s"
+
     def test_setup_with_format_string(self) -> None:
         """Test that custom format string is applied."""
         # Act
@@ -10,7 +10,8 @@ from typing import Dict, Any
 from comfyui_agent.queue_manager import (
     should_run_next,
     apply_god_mode,
-    set_job_priority
+    set_job_priority,
+    clamp_priority
 )
 
 
@@ -153,4 +154,19 @@ class TestSetJobPriority:
         init_db(db_path)
         
         # Act & Assert - should not raise but log warning
-        set_job_priority(db_path, "nonexistent.yaml", 50)
\ No newline at end of file
+        set_job_priority(db_path, "nonexistent.yaml", 50)
+
+
+class TestClampPriority:
+    """Tests for clamp_priority function."""
+
+    def test_keeps_value_within_range(self) -> None:
+        """Test that in-range priorities are unchanged."""
+        # Act & Assert
+        assert clamp_priority(25) == 25
+
+    def test_clamps_to_bounds(self) -> None:
+        """Test that out-of-range priorities are clamped."""
+        # Act & Assert
+        assert clamp_priority(1500) == 999
+        assert clamp_priority(-5) == 1
@@ -5,13 +5,50 @@ Following TDD principles - tests written before implementation.
 
 import pytest
 import json
+import sqlite3
+import tempfile
 from fastapi.testclient import TestClient
-from typing import Dict, Any
+from typing import Dict, Any, Iterable
 
 # Import the module we're going to implement
 from comfyui_agent.ui_server import app, set_db_path
 
 
+# comfyui_jobs columns from initialize.py, without the NOT NULL/CHECK
+# constraints so tests only fill in the columns they exercise
+JOBS_TABLE_SQL = """
+    CREATE TABLE comfyui_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, config_name TEXT UNIQUE, job_type TEXT,
+        workflow_id TEXT, priority INTEGER DEFAULT 50, status TEXT,
+        run_count INTEGER DEFAULT 0, retries_attempted INTEGER DEFAULT 0,
+        retry_limit INTEGER DEFAULT 2, start_time TEXT, end_time TEXT, duration REAL,
+        error_trace TEXT, metadata TEXT, worker_id TEXT, lease_expires_at TEXT
+    )
+"""
+
+
+def _create_jobs_db(rows: Iterable[Dict[str, Any]] = ()) -> str:
+    """Create a temporary database holding a comfyui_jobs table.
+    
+    Args:
+        rows: Column/value mappings inserted in order.
+        
+    Returns:
+        Path to the new database file.
+    """
+    db_path = f"{tempfile.mkdtemp()}/test.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(JOBS_TABLE_SQL)
+    for row in rows:
+        conn.execute(
+            f"INSERT INTO comfyui_jobs ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+            tuple(row.values())
+        )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
 class TestListQueue:
     """Tests for list_queue endpoint."""
 
@@ -70,7 +107,7 @@ class TestListQueue:
         response = self.client.get("/api/queue?status=invalid")
         
         # Assert
-        assert response.status_code == 400
+        assert response.status_code == 422
 
 
 class TestSetPriority:
@@ -234,6 +271,46 @@ class TestJobDetails:
         assert response.status_code == 404
 
 
+class TestJobsBatch:
+    """Tests for jobs_batch endpoint."""
+
+    def setup_method(self):
+        """Set up test client and a jobs table with two pending jobs."""
+        self.db_path = _create_jobs_db(
+            {"config_name": name, "job_type": "T2I", "workflow_id": "wf", "status": "pending"}
+            for name in ("a.yaml", "b.yaml")
+        )
+        set_db_path(self.db_path)
+        
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Release pooled connections."""
+        from comfyui_agent.db_pool import close_pools
+        close_pools()
+
+    def test_returns_jobs_keyed_by_config_name(self) -> None:
+        """Test fetching several jobs in one request."""
+        # Act
+        response = self.client.get("/api/queue/batch?config_names=a.yaml,b.yaml,missing.yaml")
+        
+        # Assert
+        assert response.status_code == 200
+        jobs = response.json()
+        assert set(jobs) == {"a.yaml", "b.yaml"}
+
+    def test_too_many_names_returns_error(self) -> None:
+        """Test that oversized batches are rejected."""
+        # Arrange
+        names = ",".join(f"job{i}.yaml" for i in range(300))
+        
+        # Act
+        response = self.client.get(f"/api/queue/batch?config_names={names}")
+        
+        # Assert
+        assert response.status_code == 400
+
+
 class TestGodMode:
     """Tests for god_mode endpoint."""
 
@@ -290,4 +367,592 @@ class TestHealthCheck:
         
         # Assert
         assert response.status_code == 200
-        assert response.json()["status"] == "healthy"
\ No newline at end of file
+        assert response.json()["status"] == "healthy"
+
+class TestCORSMiddleware:
+    """Tests for the pure ASGI CORS middleware."""
+
+    def setup_method(self):
+        """Set up test client."""
+        self.client = TestClient(app)
+
+    def test_adds_allow_origin_header(self) -> None:
+        """Test that cross-origin responses carry the CORS header."""
+        # Act
+        response = self.client.get("/health", headers={"Origin": "http://example.com"})
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "*"
+
+    def test_preflight_short_circuits(self) -> None:
+        """Test that preflight requests are answered by the middleware."""
+        # Act
+        response = self.client.options("/api/queue", headers={
+            "Origin": "http://example.com",
+            "Access-Control-Request-Method": "PUT",
+            "Access-Control-Request-Headers": "content-type",
+        })
+        
+        # Assert
+        assert response.status_code == 204
+        assert "PUT" in response.headers["access-control-allow-methods"]
+        assert response.headers["access-control-allow-headers"] == "*"
+
+
+class TestGZip:
+    """Tests for response compression."""
+
+    def setup_method(self):
+        """Set up test client."""
+        self.client = TestClient(app)
+
+    def test_large_responses_are_gzipped(self) -> None:
+        """Test that responses above the threshold are compressed."""
+        # Act
+        response = self.client.get("/", headers={"Accept-Encoding": "gzip"})
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+
+    def test_small_responses_are_not_gzipped(self) -> None:
+        """Test that tiny responses skip compression."""
+        # Act
+        response = self.client.get("/health", headers={"Accept-Encoding": "gzip"})
+        
+        # Assert
+        assert "content-encoding" not in response.headers
+
+
+class TestStaticFiles:
+    """Tests for the cached static file mount."""
+
+    def setup_method(self):
+        """Set up test client."""
+        self.client = TestClient(app)
+
+    def test_index_served_with_cache_headers(self) -> None:
+        """Test that the dashboard is served with ETag and Cache-Control."""
+        # Act
+        response = self.client.get("/")
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["etag"]
+        assert response.headers["cache-control"] == "no-cache"
+
+    def test_matching_etag_returns_not_modified(self) -> None:
+        """Test that revalidation with a matching ETag returns 304."""
+        # Arrange
+        etag = self.client.get("/").headers["etag"]
+        
+        # Act
+        response = self.client.get("/index.html", headers={"If-None-Match": etag})
+        
+        # Assert
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_weak_listed_and_wildcard_etags_return_not_modified(self) -> None:
+        """Test that static revalidation matches If-None-Match like the API endpoints."""
+        # Arrange
+        etag = self.client.get("/").headers["etag"]
+        
+        # Act
+        statuses = [
+            self.client.get("/index.html", headers={"If-None-Match": value}).status_code
+            for value in (f"W/{etag}", f'"other", {etag}', "*", '"other"')
+        ]
+        
+        # Assert
+        assert statuses == [304, 304, 304, 200]
+
+    def test_fingerprinted_assets_cached_as_immutable(self) -> None:
+        """Test that hashed asset names get a long-lived immutable policy."""
+        from comfyui_agent.ui_server import _cache_control_for
+        
+        # Act & Assert
+        assert "immutable" in _cache_control_for("assets/app.3f9a1c2e.js")
+        assert "immutable" in _cache_control_for("styles-0a1b2c3d4e.css")
+        assert _cache_control_for("app.js") == "public, max-age=86400"
+        assert _cache_control_for("index.html") == "no-cache"
+
+
+class TestRetryJobSync:
+    """Tests for the single-statement retry helper."""
+
+    def setup_method(self):
+        """Create a jobs table with one failed and one done job."""
+        self.db_path = _create_jobs_db([
+            {"config_name": "failed.yaml", "status": "failed", "error_trace": "boom", "worker_id": "w1"},
+            {"config_name": "done.yaml", "status": "done"},
+        ])
+
+    def teardown_method(self):
+        """Release pooled connections."""
+        from comfyui_agent.db_pool import close_pools
+        close_pools()
+
+    def test_failed_job_reset_in_place(self) -> None:
+        """Test that the UPDATE ... RETURNING row is returned directly."""
+        from comfyui_agent.ui_server import _retry_job_sync
+        
+        # Act
+        job = _retry_job_sync(self.db_path, "failed.yaml")
+        
+        # Assert
+        assert job["status"] == "pending"
+        assert job["error_trace"] is None
+        assert job["worker_id"] is None
+
+    def test_error_paths_distinguish_missing_and_not_failed(self) -> None:
+        """Test 404 for unknown jobs and 400 for jobs that are not failed."""
+        from fastapi import HTTPException
+        from comfyui_agent.ui_server import _retry_job_sync
+        
+        # Act & Assert
+        with pytest.raises(HTTPException) as missing:
+            _retry_job_sync(self.db_path, "nonexistent.yaml")
+        with pytest.raises(HTTPException) as not_failed:
+            _retry_job_sync(self.db_path, "done.yaml")
+        assert missing.value.status_code == 404
+        assert not_failed.value.status_code == 400
+
+    def test_retry_by_id_resets_any_status_and_404s_unknown_ids(self) -> None:
+        """Test that retry by ID resets the job and reports missing IDs."""
+        from fastapi import HTTPException
+        from comfyui_agent.ui_server import _retry_job_by_id_sync
+        
+        # Act
+        _retry_job_by_id_sync(self.db_path, 2)
+        with pytest.raises(HTTPException) as missing:
+            _retry_job_by_id_sync(self.db_path, 999)
+        
+        # Assert
+        conn = sqlite3.connect(self.db_path)
+        status = conn.execute("SELECT status FROM comfyui_jobs WHERE id = 2").fetchone()[0]
+        conn.close()
+        assert status == "pending"
+        assert missing.value.status_code == 404
+
+
+class TestConditionalPolling:
+    """Tests for ETag revalidation on polled endpoints."""
+
+    def setup_method(self):
+        """Set up test client and a jobs table with one pending job."""
+        self.db_path = _create_jobs_db([
+            {"config_name": "job.yaml", "status": "pending", "priority": 50},
+        ])
+        set_db_path(self.db_path)
+        
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Release pooled connections."""
+        from comfyui_agent.db_pool import close_pools
+        close_pools()
+
+    def test_queue_matching_etag_returns_not_modified(self) -> None:
+        """Test that an unchanged queue revalidates with 304."""
+        # Arrange
+        first = self.client.get("/api/queue")
+        
+        # Act
+        response = self.client.get("/api/queue", headers={"If-None-Match": first.headers["etag"]})
+        
+        # Assert
+        assert first.status_code == 200
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_stats_stale_etag_returns_body(self) -> None:
+        """Test that a stale ETag gets the full stats body."""
+        # Act
+        response = self.client.get("/api/stats", headers={"If-None-Match": '"stale"'})
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["etag"] != '"stale"'
+        assert response.json()["total_jobs"] == 1
+
+
+class TestErrorResponses:
+    """Tests for sanitized server error responses."""
+
+    def setup_method(self):
+        """Point the server at a database that cannot be opened."""
+        self.temp_dir = tempfile.mkdtemp()
+        set_db_path(f"{self.temp_dir}/missing/test.db")
+        self.client = TestClient(app)
+
+    def test_internal_error_detail_is_generic(self) -> None:
+        """Test that exception text is logged, not returned to the client."""
+        # Act
+        response = self.client.get("/api/stats")
+        
+        # Assert
+        assert response.status_code == 500
+        assert response.json()["detail"] == "Internal server error"
+
+
+class TestQueueIndexes:
+    """Tests for startup index creation."""
+
+    def test_missing_indexes_created_once(self) -> None:
+        """Test that queue indexes are added idempotently."""
+        from comfyui_agent.db_pool import close_pools
+        from comfyui_agent.ui_server import QUEUE_INDEXES, _ensure_queue_indexes_sync
+        
+        # Arrange
+        db_path = _create_jobs_db()
+        
+        # Act
+        _ensure_queue_indexes_sync(db_path)
+        _ensure_queue_indexes_sync(db_path)
+        close_pools()
+        
+        # Assert
+        conn = sqlite3.connect(db_path)
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        conn.close()
+        assert set(QUEUE_INDEXES) <= names
+
+    def test_superseded_index_dropped(self) -> None:
+        """Test that the (status, priority) prefix index is replaced, not kept."""
+        from comfyui_agent.db_pool import close_pools
+        from comfyui_agent.ui_server import _ensure_queue_indexes_sync
+        
+        # Arrange
+        db_path = _create_jobs_db()
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE INDEX idx_comfyui_jobs_status_priority ON comfyui_jobs(status, priority)")
+        conn.commit()
+        conn.close()
+        
+        # Act
+        _ensure_queue_indexes_sync(db_path)
+        close_pools()
+        
+        # Assert
+        conn = sqlite3.connect(db_path)
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        conn.close()
+        assert "idx_comfyui_jobs_status_priority" not in names
+        assert "idx_comfyui_jobs_status_priority_name" in names
+
+    def test_hot_queries_avoid_scans_and_sorts(self) -> None:
+        """Test that status filters use an index and ORDER BY id needs no sort."""
+        from comfyui_agent.db_pool import close_pools
+        from comfyui_agent.ui_server import _ensure_queue_indexes_sync
+        
+        # Arrange
+        db_path = _create_jobs_db()
+        _ensure_queue_indexes_sync(db_path)
+        close_pools()
+        
+        def plan(sql: str) -> str:
+            conn = sqlite3.connect(db_path)
+            detail = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql))
+            conn.close()
+            return detail
+        
+        # Act
+        retry_failed = plan("UPDATE comfyui_jobs SET status = 'pending' WHERE status = 'failed'")
+        list_all = plan("SELECT * FROM comfyui_jobs ORDER BY id DESC")
+        
+        # Assert
+        assert "USING INDEX" in retry_failed
+        assert "TEMP B-TREE" not in list_all
+
+
+class TestStatsSync:
+    """Tests for the single-query stats helper."""
+
+    def test_counts_total_and_average_from_one_query(self) -> None:
+        """Test per-status counts, total and average done duration."""
+        from comfyui_agent.db_pool import close_pools
+        from comfyui_agent.ui_server import _get_stats_sync
+        
+        # Arrange
+        db_path = _create_jobs_db(
+            {"status": status, "duration": duration} for status, duration in [
+                ("done", 2.0), ("done", 4.0), ("done", None), ("failed", 9.0), ("pending", None)
+            ]
+        )
+        
+        # Act
+        stats = _get_stats_sync(db_path)
+        close_pools()
+        
+        # Assert
+        assert stats["total_jobs"] == 5
+        assert stats["by_status"] == {"done": 3, "failed": 1, "pending": 1}
+        assert stats["avg_duration_seconds"] == 3.0
+
+
+class TestExportCsv:
+    """Tests for the streamed CSV export."""
+
+    def setup_method(self):
+        """Set up test client and a jobs table with three pending jobs."""
+        self.db_path = _create_jobs_db(
+            {"config_name": f"job{i}.yaml", "job_type": "T2I", "workflow_id": "wf", "status": "pending"}
+            for i in range(3)
+        )
+        set_db_path(self.db_path)
+        
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Release pooled connections."""
+        from comfyui_agent.db_pool import close_pools
+        close_pools()
+
+    def test_export_streams_header_and_rows_newest_first(self) -> None:
+        """Test that the export contains the header and every job."""
+        # Act
+        response = self.client.get("/api/jobs/export")
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        lines = response.text.splitlines()
+        assert lines[0].startswith("ID,Config Name")
+        assert [line.split(",")[1] for line in lines[1:]] == ["job2.yaml", "job1.yaml", "job0.yaml"]
+
+
+class TestAudiobooks:
+    """Tests for the audiobooks dashboard endpoint."""
+
+    def setup_method(self):
+        """Set up test client with an empty response cache."""
+        from comfyui_agent.ui_server import _audiobooks_cache
+        _audiobooks_cache.clear()
+        self.client = TestClient(app)
+
+    def test_books_annotated_with_stage_progress_and_summary(self, monkeypatch) -> None:
+        """Test that each book gets its pipeline stage, progress and summary."""
+        # Arrange
+        books = [
+            {"book_id": "b1", "parse_novel_status": "completed"},
+            {"book_id": "b2"},
+        ]
+        monkeypatch.setattr("comfyui_agent.ui_server.AUDIOBOOKS_AVAILABLE", True)
+        monkeypatch.setattr("comfyui_agent.ui_server.get_all_books", lambda: books, raising=False)
+        
+        # Act
+        response = self.client.get("/api/audiobooks")
+        
+        # Assert
+        assert response.status_code == 200
+        first, second = response.json()["books"]
+        assert (first["current_stage"], first["pipeline_progress"]) == (3, 20)
+        assert first["status_summary"] == "🔄 Adding metadata"
+        assert (second["current_stage"], second["pipeline_progress"]) == (2, 10)
+        assert second["total_steps"] == 12
+
+    def test_repeat_poll_served_from_cache_with_etag(self, monkeypatch) -> None:
+        """Test that polls within the TTL reuse the cached body and ETag."""
+        # Arrange
+        calls = []
+        
+        def fake_get_all_books():
+            calls.append(1)
+            return [{"book_id": "b1"}]
+        
+        monkeypatch.setattr("comfyui_agent.ui_server.AUDIOBOOKS_AVAILABLE", True)
+        monkeypatch.setattr("comfyui_agent.ui_server.get_all_books", fake_get_all_books, raising=False)
+        first = self.client.get("/api/audiobooks")
+        
+        # Act
+        response = self.client.get("/api/audiobooks", headers={"If-None-Match": first.headers["etag"]})
+        
+        # Assert
+        assert response.status_code == 304
+        assert len(calls) == 1
+
+    def test_pipeline_stage_gates_file_move_on_job_counts(self) -> None:
+        """Test that stage 6 is only reported once every audio job is complete."""
+        from comfyui_agent.ui_server import get_pipeline_stage
+        
+        # Arrange
+        done = {"parse_novel_status": "completed", "metadata_status": "completed",
+                "audio_generation_status": "completed", "total_audio_files": 4}
+        
+        # Act
+        waiting = get_pipeline_stage({**done, "audio_jobs_completed": 3})
+        ready = get_pipeline_stage({**done, "audio_jobs_completed": 4})
+        
+        # Assert
+        assert (waiting, ready) == (5, 6)
+
+    def test_stage_table_matches_cascade(self) -> None:
+        """Test that the table lookup agrees with the cascade for mixed statuses."""
+        import random
+        from comfyui_agent.ui_server import (
+            STAGE_STATUS_FIELDS, _stage_for_statuses, get_pipeline_stage,
+        )
+        
+        # Arrange
+        rng = random.Random(0)
+        values = ["completed", "processing", "pending", "failed", None]
+        
+        for _ in range(2000):
+            statuses = tuple(rng.choice(values) for _ in STAGE_STATUS_FIELDS)
+            counts = (rng.randint(1, 3), rng.randint(0, 3))
+            book = dict(zip(STAGE_STATUS_FIELDS, statuses))
+            book.update(total_audio_files=counts[0], audio_jobs_completed=counts[1])
+            
+            # Act & Assert
+            assert get_pipeline_stage(book) == _stage_for_statuses(statuses, *counts)
+
+    def test_unavailable_reported_as_503_without_stdout(self, monkeypatch, capsys) -> None:
+        """Test that a missing audiobook module is a 503 and nothing is printed."""
+        # Arrange
+        monkeypatch.setattr("comfyui_agent.ui_server.AUDIOBOOKS_AVAILABLE", False)
+        
+        # Act
+        response = self.client.get("/api/audiobooks")
+        
+        # Assert
+        assert response.status_code == 503
+        assert capsys.readouterr().out == ""
+
+    def test_book_details_looked_up_by_id(self, monkeypatch) -> None:
+        """Test that book details come from a single-book lookup."""
+        # Arrange
+        books = {"b1": {"book_id": "b1", "parse_novel_status": "completed"}}
+        monkeypatch.setattr("comfyui_agent.ui_server.AUDIOBOOKS_AVAILABLE", True)
+        monkeypatch.setattr("comfyui_agent.ui_server.get_book_by_id", books.get, raising=False)
+        
+        # Act
+        found = self.client.get("/api/audiobooks/b1")
+        missing = self.client.get("/api/audiobooks/nope")
+        
+        # Assert
+        assert found.status_code == 200
+        assert found.json()["pipeline_steps"][0]["status"] == "completed"
+        assert missing.status_code == 404
+
+    def test_detailed_steps_built_from_spec(self) -> None:
+        """Test step timestamps, status normalization and image job counts."""
+        from comfyui_agent.ui_server import get_detailed_pipeline_steps
+        
+        # Arrange
+        book = {"parse_novel_started_at": "t0", "metadata_status": "unknown",
+                "image_jobs_completed": 3, "total_image_jobs": 7}
+        
+        # Act
+        steps = get_detailed_pipeline_steps(book)
+        
+        # Assert
+        assert [s["step"] for s in steps] == list(range(1, 11))
+        assert steps[0]["started_at"] == "t0"
+        assert steps[1]["status"] == "pending"
+        assert "started_at" not in steps[3]
+        assert steps[8]["description"] == "Process image generation jobs (3/7)"
+
+
+class TestBulkJobsSync:
+    """Tests for the bulk delete/retry helpers."""
+
+    def setup_method(self):
+        """Create a jobs table with 1200 failed jobs and 10 done jobs."""
+        self.db_path = _create_jobs_db([{"status": "failed"}] * 1200 + [{"status": "done"}] * 10)
+
+    def teardown_method(self):
+        """Release pooled connections."""
+        from comfyui_agent.db_pool import close_pools
+        close_pools()
+
+    def test_bulk_retry_resets_every_failed_id_in_one_query(self) -> None:
+        """Test that one query retries every requested failed ID and skips done jobs."""
+        from comfyui_agent.ui_server import _bulk_retry_jobs_sync
+        
+        # Act
+        retried = _bulk_retry_jobs_sync(self.db_path, list(range(1, 1211)))
+        
+        # Assert
+        assert retried == 1200
+
+    def test_cancel_all_pending_marks_only_pending(self) -> None:
+        """Test that cancel-all updates comfyui_jobs and leaves other statuses."""
+        from comfyui_agent.db_pool import close_pools
+        from comfyui_agent.ui_server import _cancel_all_pending_sync
+        
+        # Arrange
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("UPDATE comfyui_jobs SET status = 'pending' WHERE id <= 3")
+        conn.commit()
+        conn.close()
+        
+        # Act
+        cancelled = _cancel_all_pending_sync(self.db_path)
+        close_pools()
+        
+        # Assert
+        conn = sqlite3.connect(self.db_path)
+        traces = conn.execute(
+            "SELECT COUNT(*) FROM comfyui_jobs WHERE error_trace = 'Cancelled by user'"
+        ).fetchone()[0]
+        conn.close()
+        assert cancelled == 3
+        assert traces == 3
+
+    def test_bulk_delete_removes_every_requested_id_in_one_query(self) -> None:
+        """Test that one query deletes every requested ID."""
+        from comfyui_agent.ui_server import _bulk_delete_jobs_sync
+        
+        # Act
+        deleted = _bulk_delete_jobs_sync(self.db_path, list(range(1, 1101)))
+        
+        # Assert
+        assert deleted == 1100
+
+
+class TestExecuteSql:
+    """Tests for the SQL console endpoint."""
+
+    def setup_method(self):
+        """Set up test client and a jobs table with two jobs."""
+        self.db_path = _create_jobs_db([{"status": "pending"}, {"status": "done"}])
+        set_db_path(self.db_path)
+        
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        """Release pooled connections."""
+        from comfyui_agent.db_pool import close_pools
+        close_pools()
+
+    def test_select_returns_rows(self) -> None:
+        """Test that SELECT results come back as row dicts."""
+        # Act
+        response = self.client.post("/api/sql", json={"query": "SELECT status FROM comfyui_jobs ORDER BY id;"})
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["rows"] == [{"status": "pending"}, {"status": "done"}]
+
+    def test_multiple_statements_rejected(self) -> None:
+        """Test that a second statement is refused before anything runs."""
+        # Act
+        response = self.client.post("/api/sql", json={
+            "query": "SELECT ';' FROM comfyui_jobs; DELETE FROM comfyui_jobs"
+        })
+        
+        # Assert
+        assert response.status_code == 400
+        assert "one SQL statement" in response.json()["detail"]
+
+    def test_dangerous_warning_matches_whole_keywords(self) -> None:
+        """Test that the warning flag ignores keywords inside identifiers."""
+        # Act
+        harmless = self.client.post("/api/sql", json={"query": "SELECT 1 AS deleted_at"})
+        dangerous = self.client.post("/api/sql", json={"query": "delete FROM comfyui_jobs WHERE id = 0"})
+        
+        # Assert
+        assert harmless.json()["warning"] is False
+        assert dangerous.json()["warning"] is True
@@ -104,6 +104,19 @@ class TestParseConfigName:
         with pytest.raises(ValueError, match="must have .yaml extension"):
             parse_config_name(filename)
 
+    def test_repeated_parse_returns_independent_results(self) -> None:
+        """Test that cached parses still hand out a fresh dict per call."""
+        # Arrange
+        filename = "T2I_20250809120030_1_cached.yaml"
+        first = parse_config_name(filename)
+        first["jobname"] = "mutated"
+        
+        # Act
+        second = parse_config_name(f"/other/dir/{filename}")
+        
+        # Assert
+        assert second["jobname"] == "cached"
+
 
 class TestValidateConfigSchema:
     """Tests for validate_config_schema function."""
@@ -199,6 +212,31 @@ class TestValidateConfigSchema:
         with pytest.raises(ValueError, match="Missing required inputs"):
             validate_config_schema(config, workflows)
 
+    def test_node_specific_inputs_satisfy_required_inputs(self) -> None:
+        """Test that node-prefixed keys satisfy required inputs by suffix."""
+        # Arrange
+        config = {
+            "job_type": "T2I",
+            "workflow_id": "wf_test",
+            "inputs": {
+                "6_text": "test",
+                "31_seed": 42,
+                "9_filename_prefix": "out"
+            },
+            "outputs": {"file_path": "/test.png"}
+        }
+        workflows = {
+            "wf_test": {
+                "required_inputs": ["prompt", "seed", "filename_prefix", "prefix"]
+            }
+        }
+        
+        # Act & Assert - should not raise
+        validate_config_schema(config, workflows)
+        workflows["wf_test"]["required_inputs"].append("steps")
+        with pytest.raises(ValueError, match="steps"):
+            validate_config_schema(config, workflows)
+
     def test_missing_outputs_file_path_raises_error(self) -> None:
         """Test that missing outputs.file_path raises ValueError."""
         # Arrange
@@ -4,66 +4,225 @@ UI server module for ComfyUI Agent.
 Provides FastAPI REST endpoints for job management and monitoring.
 """
 
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+import orjson
+from typing import Optional, List, Dict, Any, Hashable, Iterator, Literal, Tuple
+from contextlib import asynccontextmanager
+import csv
+import hashlib
+import io
+import itertools
+import mimetypes
 import os
+import re
+import sqlite3
+import sys
+import time
 from datetime import datetime
 
-from comfyui_agent.db_manager import (
-    get_job_by_config_name,
-    list_jobs_by_status,
-    get_db_connection
-)
+from comfyui_agent.db_pool import acquire_read, acquire_write, close_pools, retry_if_locked
+
+from comfyui_agent.queue_manager import clamp_priority
+from comfyui_agent.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
-# Import audiobook helper functions
-try:
-    import sys
-    import os
-    # Add parent directory to path for imports
+
+def _import_audiobook_helper() -> bool:
+    """Import the audiobook helpers used by the audiobooks dashboard routes.
+
+    Availability only reflects whether the import succeeds; the database is
+    first touched by the startup probe in ``lifespan``, not at import time.
+    The repository root is put on sys.path only if the plain import fails
+    (e.g. when this file is run directly).
+
+    Returns:
+        True if the helpers were imported.
+    """
+    global get_all_books, get_book_by_id
+    try:
+        from audiobook_agent.audiobook_helper import get_all_books, get_book_by_id
+        return True
+    except ImportError:
+        pass
+    
     parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     if parent_dir not in sys.path:
         sys.path.append(parent_dir)
-    
-    from audiobook_agent.audiobook_helper import get_all_books
-    print("✅ Audiobook helper functions imported successfully")
-    
-    # Test database access
-    test_books = get_all_books()
-    print(f"📊 Database test: Found {len(test_books)} books")
-    AUDIOBOOKS_AVAILABLE = True
-    
-except ImportError as e:
-    AUDIOBOOKS_AVAILABLE = False
-    print(f"❌ Import error: {e}")
-except Exception as e:
-    AUDIOBOOKS_AVAILABLE = False
-    print(f"❌ Database error: {e}")
-from comfyui_agent.queue_manager import set_job_priority, apply_god_mode
-from comfyui_agent.utils.logger import get_logger
+    try:
+        from audiobook_agent.audiobook_helper import get_all_books, get_book_by_id
+        return True
+    except ImportError as e:
+        logger.warning("Audiobook helpers unavailable: %s", e)
+        return False
+
+
+AUDIOBOOKS_AVAILABLE = _import_audiobook_helper()
+
+# Returned for unexpected server errors; the exception itself is only logged
+INTERNAL_ERROR_DETAIL = "Internal server error"
+
+
+class OrjsonResponse(JSONResponse):
+    """JSON response encoded with orjson instead of the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _etag_for(body: bytes) -> str:
+    """Strong ETag derived from the response body."""
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _if_none_match_hits(if_none_match: Optional[str], etag: str) -> bool:
+    """Check whether an If-None-Match header value names ``etag``.
+
+    Accepts "*", comma-separated lists and W/ weak validators, using the
+    weak comparison that If-None-Match calls for.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the client's If-None-Match already names ``etag``."""
+    return _if_none_match_hits(request.headers.get("if-none-match"), etag)
+
+
+def _conditional_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """Answer 304 when the client already holds ``body``, else send it.
+
+    Polling dashboards revalidate with If-None-Match; an unchanged queue
+    then costs no body bytes on the wire.
+    """
+    headers = {"etag": etag, "cache-control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan: prepare indexes and probe the audiobook
+    database on startup, release pooled connections on shutdown."""
+    if _db_path is not None:
+        try:
+            await run_in_threadpool(_ensure_queue_indexes_sync, _db_path)
+        except sqlite3.Error as e:
+            logger.warning("Could not create queue indexes: %s", e)
+    if AUDIOBOOKS_AVAILABLE:
+        books = await run_in_threadpool(get_all_books)
+        logger.info("Audiobook database reachable: %d books", len(books))
+    yield
+    close_pools()
 
-logger = get_logger(__name__)
 
 # Create FastAPI app
 app = FastAPI(
     title="ComfyUI Agent API",
     description="REST API for E3 ComfyUI Agent job management",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=OrjsonResponse,
+    lifespan=lifespan
 )
 
-# Add CORS middleware for web UI
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, specify allowed origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# CORS configuration for web UI (in production, specify allowed origins)
+CORS_ALLOW_ORIGINS = frozenset({"*"})
+_CORS_ALLOW_ALL = "*" in CORS_ALLOW_ORIGINS
+_CORS_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
 
-# Global database path (set by main application)
-_db_path: Optional[str] = None
+# Header tuples encoded once at import time; the send wrapper only appends them
+_CORS_WILDCARD_HEADERS = [(b"access-control-allow-origin", b"*")]
+_CORS_VARY_HEADER = (b"vary", b"Origin")
+
+# The preflight answer never varies with the request, so it is frozen too
+_CORS_PREFLIGHT_HEADERS = [
+    (b"access-control-allow-methods", _CORS_ALLOW_METHODS),
+    (b"access-control-allow-headers", b"*"),
+    (b"access-control-max-age", b"86400"),
+    (b"content-length", b"0"),
+]
+_CORS_WILDCARD_PREFLIGHT_HEADERS = _CORS_WILDCARD_HEADERS + _CORS_PREFLIGHT_HEADERS
+
+
+def _get_header(scope: Dict[str, Any], name: bytes) -> Optional[bytes]:
+    """Return a raw request header from an ASGI scope, or None if absent."""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+class PureASGIMiddleware:
+    """CORS middleware written directly against the ASGI interface.
+
+    Avoids building Starlette Request/Response objects for every call; only
+    the outgoing ``http.response.start`` message is touched to append the
+    pre-encoded CORS headers. Preflight requests are answered with a
+    precomputed 204 before reaching the router.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = _get_header(scope, b"origin")
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if _CORS_ALLOW_ALL:
+            cors_headers = _CORS_WILDCARD_HEADERS
+        elif origin.decode("latin-1") in CORS_ALLOW_ORIGINS:
+            cors_headers = [(b"access-control-allow-origin", origin), _CORS_VARY_HEADER]
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        if (scope["method"] == "OPTIONS"
+                and _get_header(scope, b"access-control-request-method") is not None):
+            if _CORS_ALLOW_ALL:
+                headers = _CORS_WILDCARD_PREFLIGHT_HEADERS
+            else:
+                headers = cors_headers + _CORS_PREFLIGHT_HEADERS
+            await send({"type": "http.response.start", "status": 204, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+app.add_middleware(PureASGIMiddleware)
+
+# Job lists and SQL results are repetitive JSON that compresses several-fold;
+# small responses (health checks, 304s) are left alone
+GZIP_MINIMUM_SIZE = 1024
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
+# Environment variable carrying the database path into server worker processes
+DB_PATH_ENV_VAR = "E3_UI_DB_PATH"
+
+# Global database path (set by main application, or inherited by workers)
+_db_path: Optional[str] = os.environ.get(DB_PATH_ENV_VAR)
 
 
 def set_db_path(path: str) -> None:
@@ -85,25 +244,54 @@ def get_db_path() -> str:
     Raises:
         RuntimeError: If database path not set.
     """
+    global _db_path
     if _db_path is None:
-        # Fallback: try default database path
+        # Fallback: try default database path (remembered once found)
         default_path = "database/comfyui_agent.db"
         if os.path.exists(default_path):
-            print(f"⚠️  Using fallback database path: {default_path}")
-            return default_path
+            logger.warning("Using fallback database path: %s", default_path)
+            _db_path = default_path
         else:
             raise RuntimeError(f"Database path not configured and default not found: {default_path}")
     return _db_path
 
 
+async def _resolve_db_path() -> str:
+    """FastAPI dependency resolving the database path for a request.
+
+    Declared async so FastAPI resolves it inline on the event loop rather
+    than dispatching a plain function to the threadpool.
+
+    Raises:
+        HTTPException: If database path not configured.
+    """
+    try:
+        return get_db_path()
+    except RuntimeError as e:
+        logger.error("Database path unavailable: %s", e)
+        raise HTTPException(status_code=500, detail="Database not configured")
+
+
+# Job statuses accepted by query filters; FastAPI rejects anything else with 422
+JobStatus = Literal["pending", "processing", "done", "failed"]
+
+
 # Pydantic models for request/response
 class PriorityUpdate(BaseModel):
-    """Model for priority update request."""
-    priority: int
+    """Model for priority update request.
+    
+    Out-of-range priorities are clamped by the handler rather than rejected,
+    so no ge/le bounds are declared here.
+    """
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
+    priority: int = Field(description="Queue priority (1 = highest)", examples=[10])
 
 
 class JobResponse(BaseModel):
-    """Model for job response."""
+    """Model for job response (documents /api/queue/{config_name})."""
+    model_config = ConfigDict(from_attributes=True)
+    
     config_name: str
     job_type: str
     workflow_id: str
@@ -115,6 +303,532 @@ class JobResponse(BaseModel):
     metadata: Optional[str] = None
 
 
+class _TTLCache:
+    """Minimal time-based cache for poll-heavy read endpoints.
+
+    Only touched from the event loop, so no locking is needed. Entries
+    expire after ``ttl`` seconds or when ``clear()`` is called by a mutation.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value until the TTL elapses."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+
+
+# Dashboards poll these far more often than the queue changes; entries hold
+# the encoded JSON body and its ETag so cache hits skip serialization and
+# hashing as well
+_queue_cache = _TTLCache(ttl=1.0)
+_stats_cache = _TTLCache(ttl=2.0)
+_jobs_cache = _TTLCache(ttl=2.0)
+
+# Books are updated by the audiobook pipeline, not through this server, so
+# this cache is never invalidated here and simply expires
+_audiobooks_cache = _TTLCache(ttl=5.0)
+
+
+def _invalidate_read_caches() -> None:
+    """Drop cached queue/stats/jobs responses after a mutation."""
+    _queue_cache.clear()
+    _stats_cache.clear()
+    _jobs_cache.clear()
+
+
+# SQL statements
+#
+# Fixed statement text shared by every call site, so each pooled connection's
+# statement cache hits instead of re-parsing and re-planning per request.
+
+SQL_LIST_ALL = """
+    SELECT * FROM comfyui_jobs
+    ORDER BY priority ASC, config_name ASC
+"""
+
+SQL_LIST_BY_STATUS = """
+    SELECT * FROM comfyui_jobs
+    WHERE status = ?
+    ORDER BY priority ASC, config_name ASC
+"""
+
+SQL_GET_JOB = "SELECT * FROM comfyui_jobs WHERE config_name = ?"
+
+# Rows fetched and encoded per batch when listing the queue
+QUEUE_FETCH_SIZE = 1000
+
+SQL_LIST_ALL_JOBS = """
+    SELECT 
+        id, config_name, job_type, workflow_id, priority, status,
+        retries_attempted, retry_limit, error_trace, metadata,
+        worker_id, lease_expires_at, start_time, end_time,
+        duration
+    FROM comfyui_jobs
+    ORDER BY id DESC
+"""
+
+# CSV export: columns in output order, and rows fetched per streamed chunk
+SQL_EXPORT_JOBS = """
+    SELECT 
+        id, config_name, job_type, workflow_id, priority, status,
+        retries_attempted, retry_limit, error_trace,
+        worker_id, start_time, end_time, duration
+    FROM comfyui_jobs
+    ORDER BY id DESC
+"""
+
+EXPORT_CSV_HEADER = (
+    'ID', 'Config Name', 'Job Type', 'Workflow', 'Priority', 'Status',
+    'Retries', 'Retry Limit', 'Error', 'Worker',
+    'Started', 'Ended', 'Duration (s)'
+)
+
+EXPORT_FETCH_SIZE = 1000
+
+# Destructive keywords flagged in /api/sql responses; whole words only, so
+# e.g. a deleted_at column does not count as DELETE
+_DANGEROUS_RE = re.compile(r"\b(?:DROP|DELETE|TRUNCATE|ALTER)\b", re.IGNORECASE)
+
+SQL_RETRY_JOB_BY_ID = """
+    UPDATE comfyui_jobs
+    SET status = 'pending',
+        error_trace = NULL,
+        worker_id = NULL,
+        lease_expires_at = NULL,
+        start_time = NULL,
+        end_time = NULL,
+        duration = NULL
+    WHERE id = ?
+    RETURNING id
+"""
+
+SQL_CANCEL_PENDING = """
+    UPDATE comfyui_jobs
+    SET status = 'failed',
+        error_trace = 'Cancelled by user'
+    WHERE status = 'pending'
+"""
+
+# Rows pulled per fetchmany() call for /api/sql SELECT results
+SQL_CONSOLE_FETCH_SIZE = 1000
+
+# Bulk endpoints bind their ID list as one JSON array expanded by json_each,
+# so the statement text is fixed (statement cache hits) whatever the list
+# length, and there is no host-parameter limit to stay under
+SQL_BULK_DELETE = """
+    DELETE FROM comfyui_jobs
+    WHERE id IN (SELECT value FROM json_each(?))
+"""
+
+SQL_BULK_RETRY = """
+    UPDATE comfyui_jobs
+    SET status = 'pending',
+        error_trace = NULL,
+        worker_id = NULL,
+        lease_expires_at = NULL,
+        start_time = NULL,
+        end_time = NULL,
+        duration = NULL
+    WHERE id IN (SELECT value FROM json_each(?)) AND status = 'failed'
+"""
+
+SQL_GET_JOBS_BATCH = """
+    SELECT * FROM comfyui_jobs
+    WHERE config_name IN (SELECT value FROM json_each(?))
+"""
+
+# Upper bound on config names accepted by /api/queue/batch
+MAX_BATCH_CONFIG_NAMES = 256
+
+SQL_JOB_EXISTS = "SELECT 1 FROM comfyui_jobs WHERE config_name = ?"
+
+SQL_UPDATE_PRIORITY = """
+    UPDATE comfyui_jobs
+    SET priority = ?
+    WHERE config_name = ?
+    RETURNING *
+"""
+
+SQL_RETRY_FAILED_JOB = """
+    UPDATE comfyui_jobs
+    SET status = 'pending',
+        error_trace = NULL,
+        worker_id = NULL,
+        lease_expires_at = NULL
+    WHERE config_name = ? AND status = 'failed'
+    RETURNING *
+"""
+
+SQL_STATS = """
+    SELECT status,
+           COUNT(*) AS count,
+           SUM(CASE WHEN status = 'done' THEN duration END) AS done_duration_sum,
+           COUNT(CASE WHEN status = 'done' THEN duration END) AS done_duration_count
+    FROM comfyui_jobs
+    GROUP BY status
+"""
+
+# Indexes behind the hot read paths, created at startup for databases made
+# before they were added to initialize.py:
+#   - status filter + ORDER BY priority, config_name walks the index in order
+#   - full listing ORDER BY priority, config_name avoids a sort
+#   - stats GROUP BY status is answered from the index alone
+QUEUE_INDEXES = {
+    "idx_comfyui_jobs_status_priority_name":
+        "CREATE INDEX IF NOT EXISTS idx_comfyui_jobs_status_priority_name "
+        "ON comfyui_jobs(status, priority, config_name)",
+    "idx_comfyui_jobs_priority_name":
+        "CREATE INDEX IF NOT EXISTS idx_comfyui_jobs_priority_name "
+        "ON comfyui_jobs(priority, config_name)",
+    "idx_comfyui_jobs_status_duration":
+        "CREATE INDEX IF NOT EXISTS idx_comfyui_jobs_status_duration "
+        "ON comfyui_jobs(status, duration)",
+}
+
+# Older indexes whose columns lead an index above; they serve no query the
+# wider index cannot, so they are dropped rather than kept up to date on writes
+SUPERSEDED_QUEUE_INDEXES = ("idx_comfyui_jobs_status_priority",)
+
+
+# Blocking database helpers
+#
+# SQLite calls are synchronous, so each handler hands them to the threadpool
+# in one hop instead of running them on the event loop. Reads go through the
+# pooled read-only connections, mutations through the single pooled writer.
+
+def _column_names(cursor: sqlite3.Cursor) -> Tuple[str, ...]:
+    """Column names of the cursor's current result set."""
+    return tuple(column[0] for column in cursor.description)
+
+
+@retry_if_locked
+def _ensure_queue_indexes_sync(db_path: str) -> None:
+    """Create any missing queue indexes and drop superseded ones.
+
+    Planner stats are refreshed when an index was created.
+    """
+    with acquire_write(db_path) as conn:
+        existing = {
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = 'comfyui_jobs'"
+            )
+        }
+        superseded = [name for name in SUPERSEDED_QUEUE_INDEXES if name in existing]
+        for name in superseded:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        if superseded:
+            logger.info("Dropped %d superseded queue index(es)", len(superseded))
+        
+        missing = [ddl for name, ddl in QUEUE_INDEXES.items() if name not in existing]
+        for ddl in missing:
+            conn.execute(ddl)
+        if missing:
+            conn.execute("ANALYZE comfyui_jobs")
+            logger.info("Created %d queue index(es)", len(missing))
+
+
+def _list_queue_sync(db_path: str, status: Optional[str]) -> bytes:
+    """List jobs, optionally filtered by status, in queue order.
+
+    Rows are pulled in batches of QUEUE_FETCH_SIZE and encoded batch by
+    batch, so only one batch of row dicts is alive at a time. Dicts are
+    built by zipping the column names, read once from the cursor, with
+    each row; dict(row) would look every column up by name.
+
+    Returns:
+        JSON array of jobs, already encoded.
+    """
+    with acquire_read(db_path) as conn:
+        if status:
+            cursor = conn.execute(SQL_LIST_BY_STATUS, (status,))
+        else:
+            cursor = conn.execute(SQL_LIST_ALL)
+        
+        columns = _column_names(cursor)
+        chunks = []
+        rows = cursor.fetchmany(QUEUE_FETCH_SIZE)
+        while rows:
+            # Strip the surrounding brackets; batches are joined below
+            chunks.append(orjson.dumps([dict(zip(columns, row)) for row in rows])[1:-1])
+            rows = cursor.fetchmany(QUEUE_FETCH_SIZE)
+    
+    return b"[" + b",".join(chunks) + b"]"
+
+
+def _get_job_sync(db_path: str, config_name: str) -> Optional[Dict[str, Any]]:
+    """Fetch a single job by config name, or None if missing."""
+    with acquire_read(db_path) as conn:
+        row = conn.execute(SQL_GET_JOB, (config_name,)).fetchone()
+        return dict(row) if row else None
+
+
+def _get_jobs_batch_sync(db_path: str, config_names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch several jobs in one query, keyed by config name."""
+    with acquire_read(db_path) as conn:
+        cursor = conn.execute(SQL_GET_JOBS_BATCH, (orjson.dumps(config_names).decode(),))
+        columns = _column_names(cursor)
+        jobs = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    return {job["config_name"]: job for job in jobs}
+
+
+@retry_if_locked
+def _update_priority_sync(db_path: str, config_name: str,
+                          priority: int) -> Optional[Dict[str, Any]]:
+    """Set a job's priority and return the updated job, or None if missing."""
+    with acquire_write(db_path) as conn:
+        row = conn.execute(
+            SQL_UPDATE_PRIORITY, (clamp_priority(priority), config_name)
+        ).fetchone()
+        return dict(row) if row else None
+
+
+def _god_mode_sync(db_path: str, config_name: str) -> Optional[Dict[str, Any]]:
+    """Apply god mode (priority 1) and return the updated job, or None if missing."""
+    return _update_priority_sync(db_path, config_name, 1)
+
+
+@retry_if_locked
+def _retry_job_sync(db_path: str, config_name: str) -> Dict[str, Any]:
+    """Reset a failed job to pending and return the updated job.
+
+    The conditional UPDATE is the only statement on the success path; the
+    job is looked up again only to tell "missing" apart from "not failed".
+
+    Raises:
+        HTTPException: If job not found or not in failed state.
+    """
+    with acquire_write(db_path) as conn:
+        row = conn.execute(SQL_RETRY_FAILED_JOB, (config_name,)).fetchone()
+        if row:
+            return dict(row)
+        
+        exists = conn.execute(SQL_JOB_EXISTS, (config_name,)).fetchone()
+    
+    if not exists:
+        raise HTTPException(status_code=404, detail="Job not found")
+    raise HTTPException(status_code=400, detail="Job is not failed, cannot retry")
+
+
+def _get_stats_sync(db_path: str) -> Dict[str, Any]:
+    """Compute queue statistics with a single grouped scan.
+
+    Per-status counts, the overall total and the average duration of
+    completed jobs all come from one GROUP BY query.
+    """
+    with acquire_read(db_path) as conn:
+        rows = conn.execute(SQL_STATS).fetchall()
+    
+    status_counts = {}
+    done_duration_sum = 0.0
+    done_duration_count = 0
+    for row in rows:
+        status_counts[row["status"]] = row["count"]
+        if row["done_duration_count"]:
+            done_duration_sum += row["done_duration_sum"]
+            done_duration_count += row["done_duration_count"]
+    
+    return {
+        "total_jobs": sum(status_counts.values()),
+        "by_status": status_counts,
+        "avg_duration_seconds": (
+            done_duration_sum / done_duration_count if done_duration_count else None
+        )
+    }
+
+
+def _list_all_jobs_sync(db_path: str) -> List[Dict[str, Any]]:
+    """Fetch every job for the dashboard table, newest first."""
+    with acquire_read(db_path) as conn:
+        cursor = conn.execute(SQL_LIST_ALL_JOBS)
+        # Timestamps are stored as ISO strings and go to the UI unchanged
+        columns = _column_names(cursor)
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+@retry_if_locked
+def _retry_job_by_id_sync(db_path: str, job_id: int) -> None:
+    """Reset a job to pending by ID.
+
+    Raises:
+        HTTPException: If job not found.
+    """
+    # Reset and existence check in one statement: no row back means no job
+    with acquire_write(db_path) as conn:
+        row = conn.execute(SQL_RETRY_JOB_BY_ID, (job_id,)).fetchone()
+    
+    if row is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+
+@retry_if_locked
+def _retry_all_failed_sync(db_path: str) -> int:
+    """Reset all failed jobs to pending, returning how many were reset."""
+    with acquire_write(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE comfyui_jobs
+            SET status = 'pending',
+                error_trace = NULL,
+                worker_id = NULL,
+                lease_expires_at = NULL,
+                start_time = NULL,
+                end_time = NULL,
+                duration = NULL
+            WHERE status = 'failed'
+        """)
+        return cursor.rowcount
+
+
+@retry_if_locked
+def _cancel_all_pending_sync(db_path: str) -> int:
+    """Mark all pending jobs as cancelled, returning how many were changed.
+
+    comfyui_jobs has no 'cancelled' status (the CHECK constraint allows
+    pending/processing/done/failed), so cancelled jobs become 'failed'
+    with a 'Cancelled by user' trace and can be retried like any failure.
+    """
+    with acquire_write(db_path) as conn:
+        return conn.execute(SQL_CANCEL_PENDING).rowcount
+
+
+def _iter_jobs_csv(db_path: str) -> Iterator[bytes]:
+    """Yield every job as CSV, newest first, one batch of rows at a time.
+
+    The pooled read connection stays checked out until the generator is
+    exhausted or closed, and the buffer is reset between batches, so memory
+    use does not grow with the table.
+    """
+    output = io.StringIO()
+    writer = csv.writer(output)
+    
+    def drain() -> bytes:
+        chunk = output.getvalue().encode()
+        output.seek(0)
+        output.truncate()
+        return chunk
+    
+    with acquire_read(db_path) as conn:
+        cursor = conn.execute(SQL_EXPORT_JOBS)
+        
+        writer.writerow(EXPORT_CSV_HEADER)
+        rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+        if not rows:
+            yield drain()
+        while rows:
+            # Columns are selected in header order, so rows are written as-is
+            writer.writerows(rows)
+            yield drain()
+            rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+
+
+@retry_if_locked
+def _update_job_sync(db_path: str, job_id: int, fields: Dict[str, Any]) -> int:
+    """Update the given columns of a job, returning the affected row count."""
+    assignments = ", ".join(f"{field} = ?" for field in fields)
+    with acquire_write(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"UPDATE comfyui_jobs SET {assignments} WHERE id = ?",
+            [*fields.values(), job_id]
+        )
+        return cursor.rowcount
+
+
+@retry_if_locked
+def _bulk_delete_jobs_sync(db_path: str, ids: List[Any]) -> int:
+    """Delete jobs by ID, returning how many were deleted."""
+    with acquire_write(db_path) as conn:
+        cursor = conn.execute(SQL_BULK_DELETE, (orjson.dumps(ids).decode(),))
+        return cursor.rowcount
+
+
+@retry_if_locked
+def _bulk_retry_jobs_sync(db_path: str, ids: List[Any]) -> int:
+    """Reset the failed jobs among ``ids`` to pending, returning the count."""
+    with acquire_write(db_path) as conn:
+        cursor = conn.execute(SQL_BULK_RETRY, (orjson.dumps(ids).decode(),))
+        return cursor.rowcount
+
+
+def _is_single_statement(query: str) -> bool:
+    """Check that ``query`` holds at most one SQL statement.
+
+    A ';' only ends a statement when the text up to it is complete SQL
+    (not inside a string literal or comment); anything after that first
+    statement besides whitespace means there is a second one.
+    """
+    for i, char in enumerate(query):
+        if char == ";" and sqlite3.complete_statement(query[:i + 1]):
+            return not query[i + 1:].strip()
+    return True
+
+
+def _execute_sql_sync(db_path: str, query: str, is_dangerous: bool) -> Dict[str, Any]:
+    """Run an ad-hoc SQL statement from the dashboard console.
+
+    Raises:
+        HTTPException: If SQLite rejects the statement.
+    """
+    # SELECTs run on a read-only pooled connection, everything else on the writer
+    is_select = query.upper().startswith("SELECT")
+    acquire = acquire_read if is_select else acquire_write
+    
+    with acquire(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.arraysize = SQL_CONSOLE_FETCH_SIZE
+        
+        try:
+            cursor.execute(query)
+            
+            if is_select:
+                # Return query results, converting one batch of rows at a time
+                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                rows = []
+                batch = cursor.fetchmany()
+                while batch:
+                    if columns:
+                        rows.extend(dict(zip(columns, row)) for row in batch)
+                    else:
+                        rows.extend(list(row) for row in batch)
+                    batch = cursor.fetchmany()
+                
+                return {
+                    "type": "select",
+                    "columns": columns,
+                    "rows": rows,
+                    "count": len(rows),
+                    "warning": is_dangerous
+                }
+            else:
+                # Return affected rows for non-SELECT queries
+                affected = cursor.rowcount
+                
+                return {
+                    "type": "update",
+                    "affected_rows": affected,
+                    "warning": is_dangerous,
+                    "message": f"Query executed successfully. {affected} rows affected."
+                }
+                
+        except Exception as e:
+            # acquire_write rolls back as the HTTPException propagates
+            raise HTTPException(status_code=400, detail=f"SQL Error: {str(e)}")
+
+
 # API Endpoints
 
 @app.get("/health")
@@ -127,34 +841,73 @@ async def health_check():
     return {"status": "healthy", "service": "ComfyUI Agent"}
 
 
-@app.get("/api/queue", response_model=List[Dict[str, Any]])
-async def list_queue(status: Optional[str] = Query(None, description="Filter by status")):
+@app.get("/api/queue")
+async def list_queue(
+    request: Request,
+    status: Optional[JobStatus] = Query(None, description="Filter by status"),
+    db_path: str = Depends(_resolve_db_path)
+):
     """List jobs in the queue.
     
+    Invalid status values are rejected with 422 during request validation.
+    Responses carry an ETag; a matching If-None-Match returns 304.
+    
     Args:
         status: Optional status filter (pending, processing, done, failed).
         
     Returns:
         List of jobs.
+    """
+    try:
+        cache_key = (db_path, status or "")
+        cached = _queue_cache.get(cache_key)
+        if cached is None:
+            body = await run_in_threadpool(_list_queue_sync, db_path, status)
+            cached = (body, _etag_for(body))
+            _queue_cache.set(cache_key, cached)
+        return _conditional_json_response(request, *cached)
+    except Exception:
+        logger.exception("Error listing jobs")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
+
+
+@app.get("/api/queue/batch")
+async def jobs_batch(
+    config_names: str = Query(..., description="Comma-separated config filenames"),
+    db_path: str = Depends(_resolve_db_path)
+):
+    """Get several jobs in a single request.
+    
+    Lets the UI fetch details for many queued jobs with one SQL query
+    instead of one /api/queue/{config_name} call per job.
+    
+    Args:
+        config_names: Comma-separated config filenames.
+        
+    Returns:
+        Dictionary mapping config name to job details; unknown names are omitted.
         
     Raises:
-        HTTPException: If invalid status provided.
+        HTTPException: If no names or too many names provided.
     """
-    valid_statuses = {"pending", "processing", "done", "failed"}
-    if status and status not in valid_statuses:
-        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of {valid_statuses}")
+    names = list(dict.fromkeys(name.strip() for name in config_names.split(",") if name.strip()))
+    if not names:
+        raise HTTPException(status_code=400, detail="No config names provided")
+    if len(names) > MAX_BATCH_CONFIG_NAMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many config names (max {MAX_BATCH_CONFIG_NAMES})"
+        )
     
     try:
-        db_path = get_db_path()
-        jobs = list_jobs_by_status(db_path, status)
-        return jobs
-    except Exception as e:
-        logger.error(f"Error listing jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        return await run_in_threadpool(_get_jobs_batch_sync, db_path, names)
+    except Exception:
+        logger.exception("Error getting job batch")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
-@app.get("/api/queue/{config_name}", response_model=Dict[str, Any])
-async def job_details(config_name: str):
+@app.get("/api/queue/{config_name}", responses={200: {"model": JobResponse}})
+async def job_details(config_name: str, db_path: str = Depends(_resolve_db_path)):
     """Get detailed information about a specific job.
     
     Args:
@@ -167,8 +920,7 @@ async def job_details(config_name: str):
         HTTPException: If job not found.
     """
     try:
-        db_path = get_db_path()
-        job = get_job_by_config_name(db_path, config_name)
+        job = await run_in_threadpool(_get_job_sync, db_path, config_name)
         
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
@@ -176,13 +928,14 @@ async def job_details(config_name: str):
         return job
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error getting job details: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error getting job details")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.put("/api/queue/{config_name}/priority")
-async def update_priority(config_name: str, update: PriorityUpdate):
+async def update_priority(config_name: str, update: PriorityUpdate,
+                          db_path: str = Depends(_resolve_db_path)):
     """Update job priority.
     
     Args:
@@ -196,29 +949,25 @@ async def update_priority(config_name: str, update: PriorityUpdate):
         HTTPException: If job not found or update fails.
     """
     try:
-        db_path = get_db_path()
+        updated_job = await run_in_threadpool(
+            _update_priority_sync, db_path, config_name, update.priority
+        )
         
-        # Check job exists
-        job = get_job_by_config_name(db_path, config_name)
-        if not job:
+        if not updated_job:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        # Update priority
-        set_job_priority(db_path, config_name, update.priority)
-        
-        # Return updated job
-        updated_job = get_job_by_config_name(db_path, config_name)
+        _invalidate_read_caches()
         return updated_job
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error updating priority: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error updating priority")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.post("/api/queue/{config_name}/retry")
-async def retry_job(config_name: str):
+async def retry_job(config_name: str, db_path: str = Depends(_resolve_db_path)):
     """Retry a failed job.
     
     Args:
@@ -231,41 +980,19 @@ async def retry_job(config_name: str):
         HTTPException: If job not found or not in failed state.
     """
     try:
-        db_path = get_db_path()
-        
-        # Check job exists and is failed
-        job = get_job_by_config_name(db_path, config_name)
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-        
-        if job["status"] != "failed":
-            raise HTTPException(status_code=400, detail="Job is not failed, cannot retry")
-        
-        # Reset job to pending
-        with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE comfyui_jobs
-                SET status = 'pending',
-                    error_trace = NULL,
-                    worker_id = NULL,
-                    lease_expires_at = NULL
-                WHERE config_name = ?
-            """, (config_name,))
-        
-        # Return updated job
-        updated_job = get_job_by_config_name(db_path, config_name)
+        updated_job = await run_in_threadpool(_retry_job_sync, db_path, config_name)
+        _invalidate_read_caches()
         return updated_job
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error retrying job: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error retrying job")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.post("/api/queue/{config_name}/god-mode")
-async def god_mode(config_name: str):
+async def god_mode(config_name: str, db_path: str = Depends(_resolve_db_path)):
     """Apply god mode to a job (set priority to 1).
     
     Args:
@@ -278,123 +1005,69 @@ async def god_mode(config_name: str):
         HTTPException: If job not found.
     """
     try:
-        db_path = get_db_path()
+        updated_job = await run_in_threadpool(_god_mode_sync, db_path, config_name)
         
-        # Check job exists
-        job = get_job_by_config_name(db_path, config_name)
-        if not job:
+        if not updated_job:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        # Apply god mode
-        apply_god_mode(db_path, config_name)
-        
-        # Return updated job
-        updated_job = get_job_by_config_name(db_path, config_name)
+        _invalidate_read_caches()
         return updated_job
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error applying god mode: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error applying god mode")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.get("/api/stats")
-async def get_stats():
+async def get_stats(request: Request, db_path: str = Depends(_resolve_db_path)):
     """Get system statistics.
     
+    Responses carry an ETag; a matching If-None-Match returns 304.
+    
     Returns:
         Statistics dictionary.
     """
     try:
-        db_path = get_db_path()
-        
-        with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
+        cached = _stats_cache.get(db_path)
+        if cached is None:
+            stats = await run_in_threadpool(_get_stats_sync, db_path)
+            body = orjson.dumps(stats)
+            cached = (body, _etag_for(body))
+            _stats_cache.set(db_path, cached)
+        return _conditional_json_response(request, *cached)
             
-            # Get counts by status
-            cursor.execute("""
-                SELECT status, COUNT(*) as count
-                FROM comfyui_jobs
-                GROUP BY status
-            """)
-            status_counts = {row["status"]: row["count"] for row in cursor.fetchall()}
-            
-            # Get total jobs
-            cursor.execute("SELECT COUNT(*) as total FROM comfyui_jobs")
-            total = cursor.fetchone()["total"]
-            
-            # Get average duration for completed jobs
-            cursor.execute("""
-                SELECT AVG(duration) as avg_duration
-                FROM comfyui_jobs
-                WHERE status = 'done' AND duration IS NOT NULL
-            """)
-            avg_duration = cursor.fetchone()["avg_duration"]
-            
-            return {
-                "total_jobs": total,
-                "by_status": status_counts,
-                "avg_duration_seconds": avg_duration
-            }
-            
-    except Exception as e:
-        logger.error(f"Error getting stats: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error getting stats")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.get("/api/jobs")
-async def list_all_jobs():
+async def list_all_jobs(request: Request, db_path: str = Depends(_resolve_db_path)):
     """List all jobs with full details for dashboard.
     
+    Responses carry an ETag; a matching If-None-Match returns 304.
+    
     Returns:
         List of all jobs with complete information.
     """
     try:
-        db_path = get_db_path()
-        
-        with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT 
-                    id, config_name, job_type, workflow_id, priority, status,
-                    retries_attempted, retry_limit, error_trace, metadata,
-                    worker_id, lease_expires_at, start_time, end_time,
-                    duration
-                FROM comfyui_jobs
-                ORDER BY id DESC
-            """)
-            
-            jobs = []
-            for row in cursor.fetchall():
-                job = dict(row)
-                # Convert timestamps to ISO format for JS
-                for field in ['start_time', 'end_time', 'lease_expires_at']:
-                    if job.get(field):
-                        job[field] = job[field]
-                jobs.append(job)
+        cached = _jobs_cache.get(db_path)
+        if cached is None:
+            jobs = await run_in_threadpool(_list_all_jobs_sync, db_path)
+            body = orjson.dumps(jobs)
+            cached = (body, _etag_for(body))
+            _jobs_cache.set(db_path, cached)
+        return _conditional_json_response(request, *cached)
             
-            return jobs
-            
-    except Exception as e:
-        logger.error(f"Error listing all jobs: {e}")
-        import traceback
-        traceback.print_exc()
-        
-        # Return detailed error for debugging
-        error_detail = {
-            "error": str(e),
-            "type": type(e).__name__,
-            "db_path_set": _db_path is not None,
-            "db_path": _db_path,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        raise HTTPException(status_code=500, detail=error_detail)
+    except Exception:
+        logger.exception("Error listing all jobs")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.post("/api/job/{job_id}/retry")
-async def retry_job_by_id(job_id: int):
+async def retry_job_by_id(job_id: int, db_path: str = Depends(_resolve_db_path)):
     """Retry a job by ID.
     
     Args:
@@ -404,168 +1077,77 @@ async def retry_job_by_id(job_id: int):
         Updated job information.
     """
     try:
-        db_path = get_db_path()
-        
-        with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Check if job exists
-            cursor.execute("SELECT * FROM comfyui_jobs WHERE id = ?", (job_id,))
-            job = cursor.fetchone()
-            
-            if not job:
-                raise HTTPException(status_code=404, detail="Job not found")
-            
-            # Reset job to pending
-            cursor.execute("""
-                UPDATE comfyui_jobs
-                SET status = 'pending',
-                    error_trace = NULL,
-                    worker_id = NULL,
-                    lease_expires_at = NULL,
-                    start_time = NULL,
-                    end_time = NULL,
-                    duration = NULL
-                WHERE id = ?
-            """, (job_id,))
-            
-            return {"status": "success", "message": f"Job {job_id} queued for retry"}
+        await run_in_threadpool(_retry_job_by_id_sync, db_path, job_id)
+        _invalidate_read_caches()
+        return {"status": "success", "message": f"Job {job_id} queued for retry"}
             
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error retrying job {job_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error retrying job %s", job_id)
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.post("/api/jobs/retry-failed")
-async def retry_all_failed():
+async def retry_all_failed(db_path: str = Depends(_resolve_db_path)):
     """Retry all failed jobs.
     
     Returns:
         Number of jobs queued for retry.
     """
     try:
-        db_path = get_db_path()
-        
-        with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Reset all failed jobs to pending
-            cursor.execute("""
-                UPDATE comfyui_jobs
-                SET status = 'pending',
-                    error_trace = NULL,
-                    worker_id = NULL,
-                    lease_expires_at = NULL,
-                    start_time = NULL,
-                    end_time = NULL,
-                    duration = NULL
-                WHERE status = 'failed'
-            """)
-            
-            retry_count = cursor.rowcount
+        retry_count = await run_in_threadpool(_retry_all_failed_sync, db_path)
+        _invalidate_read_caches()
+        return {"status": "success", "retried": retry_count}
             
-            return {"status": "success", "retried": retry_count}
-            
-    except Exception as e:
-        logger.error(f"Error retrying failed jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error retrying failed jobs")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.post("/api/jobs/cancel-all")
-async def cancel_all_pending():
+async def cancel_all_pending(db_path: str = Depends(_resolve_db_path)):
     """Cancel all pending jobs.
     
     Returns:
         Number of jobs cancelled.
     """
     try:
-        db_path = get_db_path()
-        
-        with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Mark all pending jobs as cancelled
-            cursor.execute("""
-                UPDATE jobs
-                SET status = 'cancelled',
-                    error_trace = 'Cancelled by user'
-                WHERE status = 'pending'
-            """)
-            
-            cancel_count = cursor.rowcount
-            
-            return {"status": "success", "cancelled": cancel_count}
+        cancel_count = await run_in_threadpool(_cancel_all_pending_sync, db_path)
+        _invalidate_read_caches()
+        return {"status": "success", "cancelled": cancel_count}
             
-    except Exception as e:
-        logger.error(f"Error cancelling pending jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error cancelling pending jobs")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.get("/api/jobs/export")
-async def export_jobs_csv():
+async def export_jobs_csv(db_path: str = Depends(_resolve_db_path)):
     """Export jobs to CSV format.
     
     Returns:
         CSV file download.
     """
     try:
-        from fastapi.responses import StreamingResponse
-        import csv
-        import io
-        
-        db_path = get_db_path()
-        
-        with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT 
-                    id, config_name, job_type, workflow_id, priority, status,
-                    retries_attempted, retry_limit, error_trace,
-                    worker_id, created_at, start_time, end_time, duration
-                FROM comfyui_jobs
-                ORDER BY id DESC
-            """)
-            
-            # Create CSV in memory
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Write header
-            writer.writerow([
-                'ID', 'Config Name', 'Job Type', 'Workflow', 'Priority', 'Status',
-                'Retries', 'Retry Limit', 'Error', 'Worker', 
-                'Created', 'Started', 'Ended', 'Duration (s)'
-            ])
-            
-            # Write data
-            for row in cursor.fetchall():
-                writer.writerow([
-                    row['id'], row['config_name'], row['job_type'], 
-                    row['workflow_id'], row['priority'], row['status'],
-                    row['retries_attempted'], row['retry_limit'], row['error_trace'],
-                    row['worker_id'], row['created_at'], row['start_time'],
-                    row['end_time'], row['duration']
-                ])
-            
-            output.seek(0)
-            
-            return StreamingResponse(
-                io.BytesIO(output.getvalue().encode()),
-                media_type="text/csv",
-                headers={
-                    "Content-Disposition": f"attachment; filename=jobs_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-                }
-            )
+        chunks = _iter_jobs_csv(db_path)
+        # Produce the first chunk up front so query errors still become a 500
+        first_chunk = await run_in_threadpool(next, chunks)
+        return StreamingResponse(
+            itertools.chain([first_chunk], chunks),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": f"attachment; filename=jobs_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            }
+        )
             
-    except Exception as e:
-        logger.error(f"Error exporting jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error exporting jobs")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.post("/api/jobs/update")
-async def update_job(job: Dict[str, Any]):
+async def update_job(job: Dict[str, Any], db_path: str = Depends(_resolve_db_path)):
     """Update a job's fields.
     
     Args:
@@ -575,7 +1157,6 @@ async def update_job(job: Dict[str, Any]):
         Success status.
     """
     try:
-        db_path = get_db_path()
         job_id = job.get('id')
         
         if not job_id:
@@ -585,34 +1166,25 @@ async def update_job(job: Dict[str, Any]):
         updateable_fields = ['config_name', 'job_type', 'workflow_id', 'priority', 
                            'status', 'retries_attempted', 'retry_limit', 'error_trace']
         
-        updates = []
-        values = []
-        for field in updateable_fields:
-            if field in job:
-                updates.append(f"{field} = ?")
-                values.append(job[field])
+        fields = {field: job[field] for field in updateable_fields if field in job}
         
-        if not updates:
+        if not fields:
             return {"status": "success", "message": "No fields to update"}
         
-        values.append(job_id)
-        
-        with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
-            query = f"UPDATE comfyui_jobs SET {', '.join(updates)} WHERE id = ?"
-            cursor.execute(query, values)
-            
-            return {"status": "success", "updated": cursor.rowcount}
+        updated = await run_in_threadpool(_update_job_sync, db_path, job_id, fields)
+        _invalidate_read_caches()
+        return {"status": "success", "updated": updated}
             
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error updating job: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error updating job")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.post("/api/jobs/bulk-delete")
-async def bulk_delete_jobs(request: Dict[str, Any]):
+async def bulk_delete_jobs(request: Dict[str, Any],
+                           db_path: str = Depends(_resolve_db_path)):
     """Delete multiple jobs by ID.
     
     Args:
@@ -627,24 +1199,20 @@ async def bulk_delete_jobs(request: Dict[str, Any]):
         if not ids:
             raise HTTPException(status_code=400, detail="No IDs provided")
         
-        db_path = get_db_path()
-        
-        with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
-            placeholders = ','.join('?' * len(ids))
-            cursor.execute(f"DELETE FROM comfyui_jobs WHERE id IN ({placeholders})", ids)
-            
-            return {"status": "success", "deleted": cursor.rowcount}
+        deleted = await run_in_threadpool(_bulk_delete_jobs_sync, db_path, ids)
+        _invalidate_read_caches()
+        return {"status": "success", "deleted": deleted}
             
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error deleting jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error deleting jobs")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.post("/api/jobs/bulk-retry")
-async def bulk_retry_jobs(request: Dict[str, Any]):
+async def bulk_retry_jobs(request: Dict[str, Any],
+                          db_path: str = Depends(_resolve_db_path)):
     """Retry multiple failed jobs.
     
     Args:
@@ -659,34 +1227,19 @@ async def bulk_retry_jobs(request: Dict[str, Any]):
         if not ids:
             raise HTTPException(status_code=400, detail="No IDs provided")
         
-        db_path = get_db_path()
-        
-        with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
-            placeholders = ','.join('?' * len(ids))
-            cursor.execute(f"""
-                UPDATE comfyui_jobs
-                SET status = 'pending',
-                    error_trace = NULL,
-                    worker_id = NULL,
-                    lease_expires_at = NULL,
-                    start_time = NULL,
-                    end_time = NULL,
-                    duration = NULL
-                WHERE id IN ({placeholders}) AND status = 'failed'
-            """, ids)
-            
-            return {"status": "success", "retried": cursor.rowcount}
+        retried = await run_in_threadpool(_bulk_retry_jobs_sync, db_path, ids)
+        _invalidate_read_caches()
+        return {"status": "success", "retried": retried}
             
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error retrying jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error retrying jobs")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.post("/api/sql")
-async def execute_sql(request: Dict[str, Any]):
+async def execute_sql(request: Dict[str, Any], db_path: str = Depends(_resolve_db_path)):
     """Execute SQL query on the database.
     
     WARNING: This endpoint can modify data. Use with caution.
@@ -698,142 +1251,100 @@ async def execute_sql(request: Dict[str, Any]):
         Query results or affected rows count.
     """
     try:
-        from fastapi import Request
-        
         query = request.get("query", "").strip()
         
         if not query:
             raise HTTPException(status_code=400, detail="No query provided")
         
-        # Basic safety check - warn about destructive operations
-        dangerous_keywords = ["DROP", "DELETE", "TRUNCATE", "ALTER"]
-        is_dangerous = any(keyword in query.upper() for keyword in dangerous_keywords)
+        # Checked before a connection (possibly the writer) is taken
+        if not _is_single_statement(query):
+            raise HTTPException(status_code=400, detail="Only one SQL statement can be run at a time")
         
-        db_path = get_db_path()
+        # Basic safety check - warn about destructive operations
+        is_dangerous = _DANGEROUS_RE.search(query) is not None
         
-        with get_db_connection(db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Check if it's a SELECT query
-            is_select = query.upper().startswith("SELECT")
-            
-            try:
-                cursor.execute(query)
-                
-                if is_select:
-                    # Return query results
-                    columns = [desc[0] for desc in cursor.description] if cursor.description else []
-                    rows = []
-                    for row in cursor.fetchall():
-                        rows.append(dict(zip(columns, row)) if columns else list(row))
-                    
-                    return {
-                        "type": "select",
-                        "columns": columns,
-                        "rows": rows,
-                        "count": len(rows),
-                        "warning": is_dangerous
-                    }
-                else:
-                    # Return affected rows for non-SELECT queries
-                    affected = cursor.rowcount
-                    conn.commit()
-                    
-                    return {
-                        "type": "update",
-                        "affected_rows": affected,
-                        "warning": is_dangerous,
-                        "message": f"Query executed successfully. {affected} rows affected."
-                    }
-                    
-            except Exception as e:
-                conn.rollback()
-                raise HTTPException(status_code=400, detail=f"SQL Error: {str(e)}")
+        result = await run_in_threadpool(_execute_sql_sync, db_path, query, is_dangerous)
+        if result["type"] != "select":
+            _invalidate_read_caches()
+        return result
                 
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error executing SQL: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error executing SQL")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 ################################################################################
 # AUDIOBOOKS DASHBOARD API ROUTES
 ################################################################################
 
+# Total pipeline steps (now includes image generation)
+TOTAL_PIPELINE_STEPS = 12
+
+# Map stages to progress percentage (12-step pipeline)
+STAGE_PROGRESS = {
+    1: 100,   # Fully completed
+    12: 95,   # Image job completion check
+    11: 90,   # Image job creation
+    10: 85,   # Image prompt generation
+    9: 80,    # Audio combination
+    8: 70,    # Subtitle generation
+    7: 60,    # Plan audio combinations
+    6: 50,    # Move audio files
+    5: 40,    # Audio completion checks
+    4: 30,    # Audio job generation
+    3: 20,    # Metadata addition
+    2: 10     # Novel parsing
+}
+
+
 @app.get("/api/audiobooks")
-async def get_audiobooks():
-    """Get all audiobooks with pipeline status."""
+async def get_audiobooks(request: Request):
+    """Get all audiobooks with pipeline status.
+    
+    Responses carry an ETag; a matching If-None-Match returns 304.
+    """
     try:
-        # Debug logging
-        print(f"🔍 Audiobooks API called. Available: {AUDIOBOOKS_AVAILABLE}")
+        cached = _audiobooks_cache.get("books")
+        if cached is not None:
+            return _conditional_json_response(request, *cached)
         
         if not AUDIOBOOKS_AVAILABLE:
-            print("❌ Audiobook functions not available")
             raise HTTPException(status_code=503, detail="Audiobook functions not available")
         
-        print("📚 Getting all books from database...")
-        books = get_all_books()
-        print(f"📊 Retrieved {len(books)} books from database")
+        books = await run_in_threadpool(get_all_books)
+        logger.debug("Retrieved %d books from database", len(books))
         
-        # Add pipeline progress calculation
-        for i, book in enumerate(books):
+        # Add pipeline progress calculation; the stage is computed once per
+        # book and reused for the summary, with no per-book console output
+        for book in books:
             try:
                 # Calculate pipeline stage and progress
                 stage = get_pipeline_stage(book)
-                total_steps = 12  # Total pipeline steps (now includes image generation)
-                
-                # Map stages to progress percentage (12-step pipeline)
-                stage_progress = {
-                    1: 100,   # Fully completed 
-                    12: 95,   # Image job completion check
-                    11: 90,   # Image job creation
-                    10: 85,   # Image prompt generation
-                    9: 80,    # Audio combination
-                    8: 70,    # Subtitle generation
-                    7: 60,    # Plan audio combinations
-                    6: 50,    # Move audio files
-                    5: 40,    # Audio completion checks
-                    4: 30,    # Audio job generation
-                    3: 20,    # Metadata addition
-                    2: 10     # Novel parsing
-                }
-                
-                book['pipeline_progress'] = stage_progress.get(stage, 0)
+                book['pipeline_progress'] = STAGE_PROGRESS.get(stage, 0)
                 book['current_stage'] = stage
-                book['total_steps'] = total_steps
-                book['status_summary'] = get_book_status_summary(book)
-                
-                print(f"  📖 Book {i+1}: {book.get('book_title', 'Unknown')} - Stage {stage}, Progress {book['pipeline_progress']}%")
+                book['total_steps'] = TOTAL_PIPELINE_STEPS
+                book['status_summary'] = get_book_status_summary(book, stage)
                 
-            except Exception as book_error:
-                print(f"⚠️  Error processing book {i+1}: {book_error}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("Error processing book %s", book.get('book_id'))
                 # Set default values for failed book processing
                 book['pipeline_progress'] = 0
                 book['current_stage'] = 1
-                book['total_steps'] = 12
+                book['total_steps'] = TOTAL_PIPELINE_STEPS
                 book['status_summary'] = "❓ Status unknown"
         
-        print(f"✅ Successfully processed {len(books)} books")
-        return {"books": books}
-        
-    except Exception as e:
-        print(f"❌ Critical error in audiobooks API: {e}")
-        logger.error(f"Error getting audiobooks: {e}")
-        import traceback
-        traceback.print_exc()
-        
-        # Return detailed error for debugging
-        error_detail = {
-            "error": str(e),
-            "type": type(e).__name__,
-            "audiobooks_available": AUDIOBOOKS_AVAILABLE,
-            "timestamp": datetime.now().isoformat()
-        }
+        body = orjson.dumps({"books": books})
+        cached = (body, _etag_for(body))
+        _audiobooks_cache.set("books", cached)
+        return _conditional_json_response(request, *cached)
         
-        raise HTTPException(status_code=500, detail=error_detail)
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error getting audiobooks")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
 
 
 @app.get("/api/audiobooks/{book_id}")
@@ -843,38 +1354,76 @@ async def get_audiobook_details(book_id: str):
         raise HTTPException(status_code=503, detail="Audiobook functions not available")
     
     try:
-        books = get_all_books()
-        book = next((b for b in books if b['book_id'] == book_id), None)
+        book = await run_in_threadpool(get_book_by_id, book_id)
         
         if not book:
             raise HTTPException(status_code=404, detail=f"Book {book_id} not found")
         
-        # Add detailed step information
+        # Add detailed step information; the record holds only JSON-native
+        # values, so it is encoded by orjson without FastAPI's encoder pass
         book['pipeline_steps'] = get_detailed_pipeline_steps(book)
         
-        return book
+        return OrjsonResponse(book)
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Error getting audiobook details: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("Error getting audiobook details")
+        raise HTTPException(status_code=500, detail=INTERNAL_ERROR_DETAIL)
+
+
+# Book columns the pipeline stage depends on, in _stage_for_statuses order
+STAGE_STATUS_FIELDS = (
+    'parse_novel_status',
+    'metadata_status',
+    'audio_generation_status',
+    'audio_files_moved_status',
+    'audio_combination_planned_status',
+    'subtitle_generation_status',
+    'audio_combination_status',
+    'image_prompts_status',
+    'image_jobs_generation_status',
+    'image_generation_status',
+)
+
+
+# The cascade only asks whether a status is 'completed', except for audio
+# generation, which also tells 'processing' and 'pending' apart from anything
+# else; these classes sit above the per-field completed bits in the mask
+_AUDIO_STATUS_SHIFT = len(STAGE_STATUS_FIELDS)
+_AUDIO_STATUS_CLASSES = ('pending', 'processing', 'failed')
+_AUDIO_STATUS_CLASS = {status: index for index, status in enumerate(_AUDIO_STATUS_CLASSES)}
 
 
 def get_pipeline_stage(book: Dict) -> int:
-    """Calculate pipeline stage for a book (copied from generate_audiobook.py)."""
+    """Calculate pipeline stage for a book (copied from generate_audiobook.py).
     
-    # Use actual database field names
-    parse_status = book.get('parse_novel_status', 'pending')
-    metadata_status = book.get('metadata_status', 'pending')
-    audio_status = book.get('audio_generation_status', 'pending')
-    audio_moved_status = book.get('audio_files_moved_status', 'pending')
-    combination_planned_status = book.get('audio_combination_planned_status', 'pending')
-    subtitle_status = book.get('subtitle_generation_status', 'pending')
-    audio_combination_status = book.get('audio_combination_status', 'pending')
-    image_prompts_status = book.get('image_prompts_status', 'pending')
-    image_jobs_generation_status = book.get('image_jobs_generation_status', 'pending')
-    image_generation_status = book.get('image_generation_status', 'pending')
+    The status columns are packed into a small bitmask and the stage is read
+    from _STAGE_TABLE, which holds the cascade's answer for every mask. The
+    audio job counts only gate stage 6, so they are checked after the lookup.
+    """
+    mask = 0
+    for bit, field in enumerate(STAGE_STATUS_FIELDS):
+        if book.get(field, 'pending') == 'completed':
+            mask |= 1 << bit
+    audio_class = _AUDIO_STATUS_CLASS.get(book.get('audio_generation_status', 'pending'), 2)
+    stage = _STAGE_TABLE[mask | audio_class << _AUDIO_STATUS_SHIFT]
+    
+    # CRITICAL: Only allow Stage 6 if audio jobs are ACTUALLY complete
+    if stage == 6:
+        total_jobs = book.get('total_audio_files', 0)
+        completed_jobs = book.get('audio_jobs_completed', 0)
+        if not (total_jobs > 0 and completed_jobs >= total_jobs):
+            return 5  # Must check/wait for audio job completion first
+    return stage
+
+
+def _stage_for_statuses(statuses: Tuple[str, ...], total_jobs: int, completed_jobs: int) -> int:
+    """Run the stage cascade for one combination of status values."""
+    (parse_status, metadata_status, audio_status, audio_moved_status,
+     combination_planned_status, subtitle_status, audio_combination_status,
+     image_prompts_status, image_jobs_generation_status,
+     image_generation_status) = statuses
     
     # PRIORITY: Check completion from highest step backwards
     # If final step is completed, book is fully completed regardless of intermediate inconsistencies
@@ -929,8 +1478,6 @@ def get_pipeline_stage(book: Dict) -> int:
         audio_status == 'completed' and
         audio_moved_status != 'completed'):
         # CRITICAL: Only allow Stage 6 if audio jobs are ACTUALLY complete
-        total_jobs = book.get('total_audio_files', 0)
-        completed_jobs = book.get('audio_jobs_completed', 0)
         if total_jobs > 0 and completed_jobs >= total_jobs:
             return 6  # Safe to move files
         else:
@@ -961,110 +1508,108 @@ def get_pipeline_stage(book: Dict) -> int:
     return 1
 
 
-def get_book_status_summary(book: Dict) -> str:
-    """Get human-readable status summary for a book."""
-    stage = get_pipeline_stage(book)
+def _build_stage_table() -> List[int]:
+    """Evaluate the stage cascade once for every status mask.
     
-    stage_descriptions = {
-        1: "✅ All steps completed",
-        12: "🔄 Checking image completion", 
-        11: "🔄 Creating image jobs",
-        10: "🔄 Generating image prompts",
-        9: "🔄 Combining audio files",
-        8: "🔄 Generating subtitles",
-        7: "🔄 Planning audio combinations",
-        6: "🔄 Moving audio files",
-        5: "🔄 Checking audio completion",
-        4: "🔄 Creating TTS jobs",
-        3: "🔄 Adding metadata",
-        2: "🔄 Parsing novel"
-    }
+    Job counts are passed as complete so gated masks record stage 6;
+    get_pipeline_stage applies the real counts.
+    """
+    table = []
+    for audio_status in _AUDIO_STATUS_CLASSES:
+        for completed_bits in range(1 << len(STAGE_STATUS_FIELDS)):
+            statuses = tuple(
+                'completed' if completed_bits >> bit & 1
+                else audio_status if field == 'audio_generation_status'
+                else 'pending'
+                for bit, field in enumerate(STAGE_STATUS_FIELDS)
+            )
+            table.append(_stage_for_statuses(statuses, 1, 1))
+    return table
+
+
+_STAGE_TABLE = _build_stage_table()
+
+
+# Human-readable summary for each pipeline stage
+STAGE_DESCRIPTIONS = {
+    1: "✅ All steps completed",
+    12: "🔄 Checking image completion",
+    11: "🔄 Creating image jobs",
+    10: "🔄 Generating image prompts",
+    9: "🔄 Combining audio files",
+    8: "🔄 Generating subtitles",
+    7: "🔄 Planning audio combinations",
+    6: "🔄 Moving audio files",
+    5: "🔄 Checking audio completion",
+    4: "🔄 Creating TTS jobs",
+    3: "🔄 Adding metadata",
+    2: "🔄 Parsing novel"
+}
+
+
+def get_book_status_summary(book: Dict, stage: Optional[int] = None) -> str:
+    """Get human-readable status summary for a book.
+    
+    Args:
+        book: Book record.
+        stage: Pipeline stage if already computed by the caller.
+    """
+    if stage is None:
+        stage = get_pipeline_stage(book)
     
-    return stage_descriptions.get(stage, "❓ Unknown status")
+    return STAGE_DESCRIPTIONS.get(stage, "❓ Unknown status")
+
+
+# Step statuses reported as-is; anything else is shown as pending
+STEP_STATUSES = frozenset({'completed', 'failed', 'processing', 'pending'})
+
+# Detailed pipeline steps: (step, name, status field, started-at field,
+# completed-at field, description); steps without timestamps use None
+PIPELINE_STEPS = (
+    (1, "Parse Novel", 'parse_novel_status', 'parse_novel_started_at',
+     'parse_novel_completed_at', "Extract and chunk novel text"),
+    (2, "Add Metadata", 'metadata_status', 'metadata_started_at',
+     'metadata_completed_at', "Add book metadata to first chunk"),
+    (3, "Generate TTS Jobs", 'audio_generation_status', 'audio_generation_started_at',
+     'audio_generation_completed_at', "Create text-to-speech audio jobs"),
+    (4, "Process Audio", 'audio_files_moved_status', None,
+     None, "Process and organize audio files"),
+    (5, "Generate Subtitles", 'subtitle_generation_status', 'subtitle_generation_started_at',
+     'subtitle_generation_completed_at', "Generate subtitle timing files"),
+    (6, "Combine Audio", 'audio_combination_status', 'audio_combination_started_at',
+     'audio_combination_completed_at', "Combine audio files into video parts"),
+    (7, "Generate Thumbnail Prompts", 'image_prompts_status', 'image_prompts_started_at',
+     'image_prompts_completed_at', "Generate AI thumbnail prompts for all parts"),
+    (8, "Create Image Jobs", 'image_jobs_generation_status', 'image_jobs_generation_started_at',
+     'image_jobs_generation_completed_at', "Create ComfyUI image generation jobs"),
+    (9, "Generate Images", 'image_generation_status', 'image_generation_started_at',
+     'image_generation_completed_at',
+     "Process image generation jobs ({image_jobs_completed}/{total_image_jobs})"),
+    (10, "Generate Videos", 'video_generation_status', 'video_generation_started_at',
+     'video_generation_completed_at', "Create video files from audio and images"),
+)
 
 
 def get_detailed_pipeline_steps(book: Dict) -> List[Dict]:
     """Get detailed step information for pipeline visualization."""
-    steps = [
-        {
-            "step": 1,
-            "name": "Parse Novel",
-            "status": get_step_status(book, 'parse_novel_status'),
-            "started_at": book.get('parse_novel_started_at'),
-            "completed_at": book.get('parse_novel_completed_at'),
-            "description": "Extract and chunk novel text"
-        },
-        {
-            "step": 2,
-            "name": "Add Metadata", 
-            "status": get_step_status(book, 'metadata_status'),
-            "started_at": book.get('metadata_started_at'),
-            "completed_at": book.get('metadata_completed_at'),
-            "description": "Add book metadata to first chunk"
-        },
-        {
-            "step": 3,
-            "name": "Generate TTS Jobs",
-            "status": get_step_status(book, 'audio_generation_status'),
-            "started_at": book.get('audio_generation_started_at'),
-            "completed_at": book.get('audio_generation_completed_at'),
-            "description": "Create text-to-speech audio jobs"
-        },
-        {
-            "step": 4,
-            "name": "Process Audio",
-            "status": get_step_status(book, 'audio_files_moved_status'),
-            "description": "Process and organize audio files"
-        },
-        {
-            "step": 5,
-            "name": "Generate Subtitles",
-            "status": get_step_status(book, 'subtitle_generation_status'),
-            "started_at": book.get('subtitle_generation_started_at'),
-            "completed_at": book.get('subtitle_generation_completed_at'),
-            "description": "Generate subtitle timing files"
-        },
-        {
-            "step": 6,
-            "name": "Combine Audio",
-            "status": get_step_status(book, 'audio_combination_status'),
-            "started_at": book.get('audio_combination_started_at'),
-            "completed_at": book.get('audio_combination_completed_at'), 
-            "description": "Combine audio files into video parts"
-        },
-        {
-            "step": 7,
-            "name": "Generate Thumbnail Prompts",
-            "status": get_step_status(book, 'image_prompts_status'),
-            "started_at": book.get('image_prompts_started_at'),
-            "completed_at": book.get('image_prompts_completed_at'),
-            "description": "Generate AI thumbnail prompts for all parts"
-        },
-        {
-            "step": 8,
-            "name": "Create Image Jobs",
-            "status": get_step_status(book, 'image_jobs_generation_status'),
-            "started_at": book.get('image_jobs_generation_started_at'),
-            "completed_at": book.get('image_jobs_generation_completed_at'),
-            "description": "Create ComfyUI image generation jobs"
-        },
-        {
-            "step": 9,
-            "name": "Generate Images",
-            "status": get_step_status(book, 'image_generation_status'),
-            "started_at": book.get('image_generation_started_at'),
-            "completed_at": book.get('image_generation_completed_at'),
-            "description": f"Process image generation jobs ({book.get('image_jobs_completed', 0)}/{book.get('total_image_jobs', 0)})"
-        },
-        {
-            "step": 10,
-            "name": "Generate Videos",
-            "status": get_step_status(book, 'video_generation_status'),
-            "started_at": book.get('video_generation_started_at'),
-            "completed_at": book.get('video_generation_completed_at'),
-            "description": "Create video files from audio and images"
-        }
-    ]
+    get = book.get
+    counts = {
+        'image_jobs_completed': get('image_jobs_completed', 0),
+        'total_image_jobs': get('total_image_jobs', 0),
+    }
+    
+    steps = []
+    for step, name, status_field, started_field, completed_field, description in PIPELINE_STEPS:
+        # Inlined get_step_status
+        status = get(status_field, 'pending')
+        if status not in STEP_STATUSES:
+            status = 'pending'
+        entry = {"step": step, "name": name, "status": status}
+        if started_field is not None:
+            entry["started_at"] = get(started_field)
+            entry["completed_at"] = get(completed_field)
+        entry["description"] = description.format_map(counts) if "{" in description else description
+        steps.append(entry)
     
     return steps
 
@@ -1072,41 +1617,137 @@ def get_detailed_pipeline_steps(book: Dict) -> List[Dict]:
 def get_step_status(book: Dict, status_field: str) -> str:
     """Get standardized status for a pipeline step."""
     status = book.get(status_field, 'pending')
-    
-    if status == 'completed':
-        return 'completed'
-    elif status == 'failed':
-        return 'failed'
-    elif status == 'processing':
-        return 'processing'
-    else:
-        return 'pending'
+    return status if status in STEP_STATUSES else 'pending'
+
+
+# Static files at or below this size are held in memory
+STATIC_PRELOAD_MAX_BYTES = 64 * 1024
+
+# HTML is not fingerprinted, so browsers revalidate it (cheap 304 via ETag);
+# other assets may be reused for a day without asking, and assets with a
+# content hash in their name (app.3f9a1c2e.js) never change, so browsers
+# keep them for a year without revalidating
+_HTML_CACHE_CONTROL = "no-cache"
+_ASSET_CACHE_CONTROL = "public, max-age=86400"
+_FINGERPRINTED_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
+_FINGERPRINTED_RE = re.compile(r"[.-][0-9a-fA-F]{8,}\.[A-Za-z0-9]+$")
 
-# Serve static files for web UI (if directory exists)
+
+def _cache_control_for(path: str) -> str:
+    """Choose the Cache-Control value for a static file path."""
+    if path.endswith(".html"):
+        return _HTML_CACHE_CONTROL
+    if _FINGERPRINTED_RE.search(path):
+        return _FINGERPRINTED_CACHE_CONTROL
+    return _ASSET_CACHE_CONTROL
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that serves small files from memory with caching headers.
+
+    Files up to STATIC_PRELOAD_MAX_BYTES are read once at startup, together
+    with their precomputed Content-Type, ETag and Cache-Control headers, so
+    the hot path does no stat() or file I/O. Larger files fall back to the
+    regular StaticFiles handling with Cache-Control added.
+    """
+
+    def __init__(self, *, directory: str, html: bool = False) -> None:
+        super().__init__(directory=directory, html=html)
+        self._preloaded: Dict[str, Tuple[bytes, Dict[str, str]]] = {}
+        self._preload(directory)
+
+    def _preload(self, directory: str) -> None:
+        """Read small files under ``directory`` into memory."""
+        for root, _, files in os.walk(directory):
+            for name in files:
+                full_path = os.path.join(root, name)
+                if os.path.getsize(full_path) > STATIC_PRELOAD_MAX_BYTES:
+                    continue
+                with open(full_path, "rb") as fh:
+                    content = fh.read()
+                
+                rel_path = os.path.normpath(os.path.relpath(full_path, directory))
+                media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                if media_type.startswith("text/"):
+                    media_type += "; charset=utf-8"
+                headers = {
+                    "content-type": media_type,
+                    "etag": _etag_for(content),
+                    "cache-control": _cache_control_for(name),
+                }
+                self._preloaded[rel_path] = (content, headers)
+        
+        # In HTML mode the root URL serves index.html
+        if self.html and "index.html" in self._preloaded:
+            self._preloaded["."] = self._preloaded["index.html"]
+
+    async def get_response(self, path: str, scope) -> Response:
+        if scope["method"] in ("GET", "HEAD"):
+            entry = self._preloaded.get(path)
+            if entry is not None:
+                content, headers = entry
+                if_none_match = _get_header(scope, b"if-none-match")
+                if if_none_match is not None and _if_none_match_hits(
+                        if_none_match.decode("latin-1"), headers["etag"]):
+                    return Response(status_code=304, headers=headers)
+                return Response(content=content, headers=headers)
+        return await super().get_response(path, scope)
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["cache-control"] = _cache_control_for(str(full_path))
+        return response
+
+
+# Serve static files for web UI (if directory exists); checked once at import
 static_dir = os.path.join(os.path.dirname(__file__), "static")
 if os.path.exists(static_dir):
-    app.mount("/", StaticFiles(directory=static_dir, html=True), name="static")
+    app.mount("/", CachedStaticFiles(directory=static_dir, html=True), name="static")
 
 
 if __name__ == "__main__":
     import uvicorn
-    import sys
     
-    # Set database path for standalone operation
+    # Set database path for standalone operation; extra workers are separate
+    # processes, so they pick it up from the environment at import
     default_db_path = "database/comfyui_agent.db"
     if os.path.exists(default_db_path):
         set_db_path(default_db_path)
+        os.environ[DB_PATH_ENV_VAR] = default_db_path
         print(f"✅ Database path set: {default_db_path}")
     else:
         print(f"❌ Warning: Database not found at {default_db_path}")
         print("   UI server will still start but some features may not work")
     
+    # Single worker unless opted in with --workers N or UI_WORKERS.
+    # The read caches (_queue_cache, _stats_cache, _jobs_cache,
+    # _audiobooks_cache), _invalidate_read_caches and the db_pool pools are
+    # per process: with several workers, a write handled by one worker does
+    # not invalidate the others, which keep serving stale responses until
+    # their cache TTLs expire (up to 5s). Every worker's SQLite writes also
+    # contend for the single database write lock via retry_if_locked.
+    args = sys.argv[1:]
+    workers = 1
+    if "--workers" in args:
+        index = args.index("--workers")
+        value = args[index + 1:index + 2]
+        del args[index:index + 2]
+        try:
+            workers = max(1, int(value[0]))
+        except (IndexError, ValueError):
+            pass
+    elif os.environ.get("UI_WORKERS"):
+        try:
+            workers = max(1, int(os.environ["UI_WORKERS"]))
+        except ValueError:
+            pass
+    
     # Get port from command line or environment variable
     port = 8080  # Default port
-    if len(sys.argv) > 1:
+    if args:
         try:
-            port = int(sys.argv[1])
+            port = int(args[0])
         except ValueError:
             pass
     elif os.environ.get("UI_PORT"):
@@ -1115,5 +1756,14 @@ if __name__ == "__main__":
         except ValueError:
             pass
     
-    print(f"Starting UI server on http://127.0.0.1:{port}")
-    uvicorn.run(app, host="127.0.0.1", port=port)
\ No newline at end of file
+    print(f"Starting UI server on http://127.0.0.1:{port} ({workers} workers)")
+    # "auto" selects uvloop and httptools when installed (uvicorn[standard])
+    uvicorn.run(
+        "comfyui_agent.ui_server:app",
+        host="127.0.0.1",
+        port=port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        log_level="warning"
+    )
\ No newline at end of file
@@ -6,21 +6,91 @@ with proper defaults and error handling.
 """
 
 import os
-from pathlib import Path
-from typing import Dict, Any
+import re
+import time
+from typing import Dict, Any, Optional, Tuple
 import yaml
 
+# Prefer the libyaml-backed loader; PyYAML builds without libyaml fall back
+# to the pure-Python one, which parses the same documents more slowly
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# ${VAR} or ${VAR:-default} references in config strings
+_ENV_VAR_RE = re.compile(r'\$\{([^}]+)\}')
+
+# Loaded configs keyed by absolute file path: ((mtime_ns, size), result).
+# Results are shared between callers and must be treated as read-only.
+_config_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+# Interpolated global configs keyed by absolute file path:
+# ((mtime_ns, size), referenced variable names, their values, result).
+# A changed file or a changed value of a referenced variable is a miss.
+_global_config_cache: Dict[
+    str, Tuple[Tuple[int, int], Tuple[str, ...], Tuple[Optional[str], ...], Dict[str, Any]]
+] = {}
+
+# How long load_workflows keeps serving a previously loaded file after it
+# disappears (e.g. while an editor replaces it) before reporting it missing
+WORKFLOWS_MISSING_GRACE_SECONDS = 5.0
+
+# time.monotonic() at which each previously loaded workflows file went missing
+_workflows_missing_since: Dict[str, float] = {}
+
+# (mtime_ns, size) of each .env file already applied to os.environ
+_env_file_signatures: Dict[str, Tuple[int, int]] = {}
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) for path, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _cached_config(path: str, signature: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+    """Return the cached result for path if the file is unchanged."""
+    entry = _config_cache.get(os.path.abspath(path))
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+    return None
+
+
+def clear_config_cache() -> None:
+    """Forget cached configs so the next load re-reads the files."""
+    _config_cache.clear()
+    _global_config_cache.clear()
+    _workflows_missing_since.clear()
+    _env_file_signatures.clear()
+
 
 def load_env_file():
-    """Load environment variables from .env file if it exists."""
-    env_file = Path(".env")
-    if env_file.exists():
-        with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ.setdefault(key.strip(), value.strip())
+    """Load environment variables from .env file if it exists.
+    
+    Existing environment variables win. The file is parsed again only when
+    its mtime or size changes, since load_global_config calls this on
+    every load.
+    """
+    env_path = os.path.abspath(".env")
+    signature = _file_signature(env_path)
+    if signature is None or _env_file_signatures.get(env_path) == signature:
+        return
+    
+    with open(env_path, 'r', encoding='utf-8') as f:
+        data = f.read()
+    
+    for line in data.splitlines():
+        line = line.strip()
+        if not line or line[0] == '#' or '=' not in line:
+            continue
+        key, _, value = line.partition('=')
+        os.environ.setdefault(key.strip(), value.strip())
+    
+    _env_file_signatures[env_path] = signature
 
 
 def load_global_config(path: str = None) -> Dict[str, Any]:
@@ -29,6 +99,9 @@ def load_global_config(path: str = None) -> Dict[str, Any]:
     Automatically loads .env file and uses E3_ENV variable to determine which 
     config file to load from root-level config directory.
     
+    The result is cached until the config file's mtime or size changes or
+    a variable it references through ${VAR} takes a different value.
+    
     Args:
         path: Legacy parameter for backward compatibility. If None, uses new config structure.
         
@@ -59,48 +132,95 @@ def load_global_config(path: str = None) -> Dict[str, Any]:
     config_path = f"config/global_{env}.yaml"
     
     # Check if config file exists
-    if not os.path.exists(config_path):
+    signature = _file_signature(config_path)
+    if signature is None:
         raise ValueError(f"Config file not found: {config_path}. Available environments: alpha, prod")
     
+    cache_key = os.path.abspath(config_path)
+    entry = _global_config_cache.get(cache_key)
+    if entry is not None:
+        cached_signature, env_names, env_values, cached = entry
+        if cached_signature == signature and tuple(map(os.environ.get, env_names)) == env_values:
+            return cached
+    
     # Load environment-specific YAML file
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f) or {}
+            raw = f.read()
+        config = yaml.load(raw, Loader=_SafeLoader) or {}
     except Exception as e:
         raise ValueError(f"Invalid YAML in config file {config_path}: {e}")
     
-    # Apply environment variable interpolation
-    config = _interpolate_env_vars(config)
+    # Apply environment variable interpolation; a file without any ${
+    # cannot reference a variable, so the tree walk is skipped
+    env_names = ()
+    if '${' in raw:
+        env_names = tuple(sorted({
+            expr.split(':-', 1)[0] for expr in _ENV_VAR_RE.findall(raw)
+        }))
+        config = _interpolate_env_vars(config)
     
     # Validate and transform config for backward compatibility
     validated_config = _validate_and_transform_config(config, env)
     
+    _global_config_cache[cache_key] = (
+        signature, env_names, tuple(map(os.environ.get, env_names)), validated_config
+    )
     return validated_config
 
 
 def _interpolate_env_vars(obj):
-    """Recursively interpolate environment variables in config values.
+    """Interpolate environment variables in config values.
     
     Replaces ${VAR} or ${VAR:-default} with environment variable values.
+    Dicts and lists are updated in place, so only strings that actually
+    reference a variable are rebuilt; callers pass freshly parsed YAML.
     """
-    if isinstance(obj, dict):
-        return {key: _interpolate_env_vars(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [_interpolate_env_vars(item) for item in obj]
-    elif isinstance(obj, str):
-        # Handle ${VAR} and ${VAR:-default} syntax
-        import re
-        def replace_var(match):
-            var_expr = match.group(1)
-            if ':-' in var_expr:
-                var_name, default_value = var_expr.split(':-', 1)
-                return os.getenv(var_name, default_value)
-            else:
-                return os.getenv(var_expr, match.group(0))  # Return original if not found
+    if isinstance(obj, str):
+        return _interpolate_string(obj)
+    
+    # Iterative walk; containers shared via YAML aliases are visited once
+    stack = [obj]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
         
-        return re.sub(r'\$\{([^}]+)\}', replace_var, obj)
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            continue
+        
+        for key, value in items:
+            if isinstance(value, str):
+                # Most values reference no variables; skip the regex for them
+                if '${' in value:
+                    node[key] = _interpolate_string(value)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    
+    return obj
+
+
+def _interpolate_string(value: str) -> str:
+    """Interpolate environment variables in a single string."""
+    if '${' not in value:
+        return value
+    return _ENV_VAR_RE.sub(_replace_env_var, value)
+
+
+def _replace_env_var(match: re.Match) -> str:
+    """Resolve one ${VAR} or ${VAR:-default} match against the environment."""
+    var_expr = match.group(1)
+    if ':-' in var_expr:
+        var_name, default_value = var_expr.split(':-', 1)
+        return os.getenv(var_name, default_value)
     else:
-        return obj
+        return os.getenv(var_expr, match.group(0))  # Return original if not found
 
 
 def _validate_and_transform_config(config: Dict[str, Any], env: str) -> Dict[str, Any]:
@@ -165,6 +285,10 @@ def load_workflows(path: str) -> Dict[str, Dict[str, Any]]:
     
     Loads workflow definitions including template paths and required inputs.
     Each workflow must have a template_path and required_inputs list.
+    The result is cached until the file's mtime or size changes; if a
+    previously loaded file disappears (e.g. while an editor replaces it),
+    the last good result is served for up to WORKFLOWS_MISSING_GRACE_SECONDS
+    before the file is reported as not found.
     
     Args:
         path: Path to the workflows YAML file.
@@ -180,14 +304,28 @@ def load_workflows(path: str) -> Dict[str, Dict[str, Any]]:
         >>> print(workflows["wf_realistic_portrait"]["template_path"])
         workflows/wf_realistic_portrait.json
     """
-    # Check if file exists
-    if not os.path.exists(path):
+    # Check if file exists, falling back to the last successful load
+    # within the grace period
+    abs_path = os.path.abspath(path)
+    signature = _file_signature(path)
+    if signature is None:
+        stale = _config_cache.get(abs_path)
+        if stale is not None:
+            now = time.monotonic()
+            missing_since = _workflows_missing_since.setdefault(abs_path, now)
+            if now - missing_since <= WORKFLOWS_MISSING_GRACE_SECONDS:
+                return stale[1]
         raise ValueError(f"Workflows file not found: {path}")
+    _workflows_missing_since.pop(abs_path, None)
+    
+    cached = _cached_config(path, signature)
+    if cached is not None:
+        return cached
     
     # Load YAML file
     try:
         with open(path, 'r', encoding='utf-8') as f:
-            workflows = yaml.safe_load(f) or {}
+            workflows = yaml.load(f, Loader=_SafeLoader) or {}
     except Exception as e:
         raise ValueError(f"Invalid YAML in workflows file: {e}")
     
@@ -205,4 +343,5 @@ def load_workflows(path: str) -> Dict[str, Dict[str, Any]]:
         if not isinstance(workflow_data["required_inputs"], list):
             raise ValueError(f"Workflow {workflow_id} required_inputs must be a list")
     
+    _config_cache[abs_path] = (signature, workflows)
     return workflows
\ No newline at end of file
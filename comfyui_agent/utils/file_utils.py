@@ -7,16 +7,29 @@ directory creation, and YAML file listing.
 
 import os
 import shutil
-import tempfile
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+
+# File name suffixes treated as job YAML
+YAML_SUFFIXES = ('.yaml', '.yml')
+
+# Directory mtimes this close to the scan time may still change within the
+# same timestamp tick, so listings that include them are not cached
+MTIME_SETTLE_NS = 2_000_000_000
+
+# (root, media_types) -> ((directory, mtime_ns) for every walked dir, files)
+_yaml_cache: Dict[Tuple[str, Tuple[str, ...]],
+                  Tuple[Tuple[Tuple[str, int], ...], List[str]]] = {}
 
 
 def ensure_directories(paths: Dict[str, str]) -> None:
     """Create directories from paths dict if they don't exist.
     
     Idempotent operation - safe to call multiple times.
-    Creates parent directories as needed.
+    Creates parent directories as needed. Directories that already exist,
+    or that are parents of another requested path, cost at most one stat().
     
     Args:
         paths: Dictionary mapping names to directory paths.
@@ -28,8 +41,14 @@ def ensure_directories(paths: Dict[str, str]) -> None:
         >>> paths = {"jobs": "/tmp/jobs", "db": "/tmp/database"}
         >>> ensure_directories(paths)
     """
-    for path in paths.values():
-        os.makedirs(path, exist_ok=True)
+    # Deepest paths first, so their parents are known to exist afterwards
+    ensured: List[str] = []
+    for path in sorted({os.path.normpath(p) for p in paths.values()}, key=len, reverse=True):
+        if any(done.startswith(path + os.sep) for done in ensured):
+            continue
+        if not os.path.isdir(path):
+            os.makedirs(path, exist_ok=True)
+        ensured.append(path)
 
 
 def list_yaml_under(root: str, *, media_types: Optional[List[str]] = None) -> List[str]:
@@ -38,6 +57,11 @@ def list_yaml_under(root: str, *, media_types: Optional[List[str]] = None) -> Li
     Recursively finds all .yaml and .yml files. Optionally filters
     by specific subdirectories (media types).
     
+    Listings are cached together with the mtime of every directory walked;
+    adding or removing an entry changes its parent's mtime, so while none
+    of them changed the cached list is returned after one stat() per
+    directory instead of a full walk.
+    
     Args:
         root: Root directory to search.
         media_types: Optional list of subdirectory names to filter by
@@ -50,35 +74,76 @@ def list_yaml_under(root: str, *, media_types: Optional[List[str]] = None) -> Li
         >>> files = list_yaml_under("/comfyui_jobs/processing")
         >>> files = list_yaml_under("/comfyui_jobs", media_types=["image", "video"])
     """
-    if not os.path.exists(root):
-        return []
-    
-    yaml_files = []
+    # Resolve root once; entry paths below it are then already absolute
+    root = os.path.abspath(root)
     
     # If media_types specified and not empty, only search those subdirs
     if media_types:
-        search_dirs = []
-        for media_type in media_types:
-            subdir = os.path.join(root, media_type)
-            if os.path.exists(subdir):
-                search_dirs.append(subdir)
+        search_dirs = [os.path.join(root, media_type) for media_type in media_types]
     else:
         search_dirs = [root]
     
-    # Walk through directories and find YAML files
+    cache_key = (root, tuple(media_types or ()))
+    cached = _yaml_cache.get(cache_key)
+    if cached is not None:
+        dir_mtimes, yaml_files = cached
+        if all(_mtime_ns(d) == mtime for d, mtime in dir_mtimes):
+            return list(yaml_files)
+    
+    # Missing search dirs simply contribute no files
+    settled_before = time.time_ns() - MTIME_SETTLE_NS
+    yaml_files = []
+    dir_mtimes: List[Tuple[str, int]] = []
     for search_dir in search_dirs:
-        for dirpath, _, filenames in os.walk(search_dir):
-            for filename in filenames:
-                if filename.endswith(('.yaml', '.yml')):
-                    yaml_files.append(os.path.abspath(os.path.join(dirpath, filename)))
+        _collect_yaml(search_dir, yaml_files, dir_mtimes)
+    
+    if all(mtime < settled_before for _, mtime in dir_mtimes):
+        _yaml_cache[cache_key] = (tuple(dir_mtimes), list(yaml_files))
+    else:
+        _yaml_cache.pop(cache_key, None)
     
     return yaml_files
 
 
+def _mtime_ns(path: str) -> int:
+    """Return the mtime of path in nanoseconds, or -1 if it can't be stat'ed."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def _collect_yaml(directory: str, yaml_files: List[str],
+                  dir_mtimes: List[Tuple[str, int]]) -> None:
+    """Append YAML files under directory to yaml_files, in os.walk order.
+    
+    Uses os.scandir so file/dir checks come from the directory listing
+    instead of a stat() per entry. Like os.walk, unreadable directories are
+    skipped and symlinked directories are not followed. Each directory's
+    mtime is recorded in dir_mtimes before it is listed.
+    """
+    dir_mtimes.append((directory, _mtime_ns(directory)))
+    try:
+        with os.scandir(directory) as entries:
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(YAML_SUFFIXES):
+                    yaml_files.append(entry.path)
+    except OSError:
+        return
+    
+    for subdir in subdirs:
+        _collect_yaml(subdir, yaml_files, dir_mtimes)
+
+
 def safe_move(src: str, dst: str) -> None:
     """Atomically move a file from src to dst.
     
-    Uses temporary file and rename for atomicity. Creates destination
+    Uses a single os.replace() when src and dst are on the same filesystem,
+    otherwise a temporary file and rename for atomicity. Creates destination
     directory if it doesn't exist. Preserves file permissions.
     
     Args:
@@ -91,43 +156,47 @@ def safe_move(src: str, dst: str) -> None:
     Examples:
         >>> safe_move("/tmp/job.yaml", "/comfyui_jobs/finished/job.yaml")
     """
-    if not os.path.exists(src):
-        raise FileNotFoundError(f"Source file not found: {src}")
-    
-    # Ensure destination directory exists
-    dst_dir = os.path.dirname(dst)
-    if dst_dir:
-        os.makedirs(dst_dir, exist_ok=True)
+    try:
+        # Try direct rename first (fastest if on same filesystem); no
+        # existence checks up front, the rename reports what is missing
+        os.replace(src, dst)
+        return
+    except FileNotFoundError:
+        # Either the source or the destination directory is missing
+        if not os.path.exists(src):
+            raise FileNotFoundError(f"Source file not found: {src}") from None
+        dst_dir = os.path.dirname(dst)
+        if dst_dir:
+            os.makedirs(dst_dir, exist_ok=True)
+        try:
+            os.replace(src, dst)
+            return
+        except OSError:
+            pass
+    except OSError:
+        pass
     
-    # Get source file permissions
+    # Cross-filesystem move required: copy to a temp file in the
+    # destination directory and rename it, so dst never holds a partial write
     src_stat = os.stat(src)
+    tmp_path = f"{dst}.tmp.{os.getpid()}.{os.urandom(4).hex()}"
     
-    # Use atomic move with temp file for safety
-    # This ensures we don't have partial writes
     try:
-        # Try direct rename first (fastest if on same filesystem)
-        os.rename(src, dst)
-    except OSError:
-        # Cross-filesystem move required
-        # Create temp file in destination directory for atomicity
-        dst_dir = os.path.dirname(dst) or '.'
-        with tempfile.NamedTemporaryFile(dir=dst_dir, delete=False) as tmp:
-            tmp_path = tmp.name
+        # Copy contents only; permissions are applied explicitly below
+        shutil.copyfile(src, tmp_path)
+        
+        # Preserve permissions
+        os.chmod(tmp_path, src_stat.st_mode)
+        
+        # Atomic rename from temp to final destination
+        os.replace(tmp_path, dst)
         
+        # Remove source after successful move
+        os.remove(src)
+    except Exception:
+        # Clean up temp file on failure
         try:
-            # Copy to temp file
-            shutil.copy2(src, tmp_path)
-            
-            # Preserve permissions
-            os.chmod(tmp_path, src_stat.st_mode)
-            
-            # Atomic rename from temp to final destination
-            os.rename(tmp_path, dst)
-            
-            # Remove source after successful move
-            os.remove(src)
-        except Exception:
-            # Clean up temp file on failure
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-            raise
\ No newline at end of file
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
\ No newline at end of file
@@ -6,12 +6,31 @@ Provides structured logging configuration for the project.
 
 import logging
 import sys
+from functools import lru_cache
 from typing import Optional
 
 
 # Track if logging has been set up to avoid duplicate handlers
 _logging_configured = False
 
+# Accepted level names; anything else falls back to INFO
+_LEVELS = {
+    "CRITICAL": logging.CRITICAL,
+    "FATAL": logging.FATAL,
+    "ERROR": logging.ERROR,
+    "WARNING": logging.WARNING,
+    "WARN": logging.WARNING,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+    "NOTSET": logging.NOTSET,
+}
+
+
+@lru_cache(maxsize=16)
+def _formatter(format: str, date_format: str) -> logging.Formatter:
+    """Return a shared Formatter for a format/date-format pair."""
+    return logging.Formatter(format, date_format)
+
 
 def setup_logging(
     level: str = "INFO",
@@ -21,7 +40,9 @@ def setup_logging(
     """Set up logging configuration for the project.
     
     Configures the root logger with specified level and format.
-    Idempotent - safe to call multiple times.
+    Idempotent - safe to call multiple times; a call that finds the root
+    logger already at the requested level, with the requested formatter on
+    every handler, returns without touching them.
     
     Args:
         level: Log level string (DEBUG, INFO, WARNING, ERROR).
@@ -36,21 +57,25 @@ def setup_logging(
     global _logging_configured
     
     # Convert level string to logging constant
-    numeric_level = getattr(logging, level.upper(), logging.INFO)
+    numeric_level = _LEVELS.get(level.upper(), logging.INFO)
     
     # Get root logger
     root_logger = logging.getLogger()
+    formatter = _formatter(format, date_format)
+    
+    # Nothing to do if already configured this way and nothing (a test, a
+    # library's basicConfig/setLevel) has changed the root logger since
+    if (_logging_configured and root_logger.level == numeric_level
+            and all(handler.formatter is formatter for handler in root_logger.handlers)):
+        return
     
     # Set level
     root_logger.setLevel(numeric_level)
     
     # Remove existing handlers to avoid duplicates
     if _logging_configured:
-        # If already configured, just update the level
-        root_logger.setLevel(numeric_level)
-        # Update formatter if handlers exist
+        # If already configured, just update the formatter if handlers exist
         for handler in root_logger.handlers:
-            formatter = logging.Formatter(format, date_format)
             handler.setFormatter(formatter)
         return
     
@@ -60,9 +85,6 @@ def setup_logging(
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
-    
-    # Create formatter
-    formatter = logging.Formatter(format, date_format)
     console_handler.setFormatter(formatter)
     
     # Add handler to root logger
@@ -7,12 +7,22 @@ ensuring they meet the required schema.
 
 import os
 import re
-from typing import Dict, Any, List
-from copy import deepcopy
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List, Tuple
 
 
 # Valid job types as per PRD
-VALID_JOB_TYPES = {"T2I", "T2V", "SPEECH", "AUDIO", "3D"}
+VALID_JOB_TYPES = frozenset({"T2I", "T2V", "SPEECH", "AUDIO", "3D"})
+
+# Alphanumeric identifier accepted in place of a timestamp (e.g., pg159)
+_IDENT_RE = re.compile(r'[a-zA-Z0-9]+')
+
+# Well-formed TYPE_IDENTIFIER_X_jobname (without extension); names it
+# rejects go through the step-by-step checks for a precise error
+_CONFIG_NAME_RE = re.compile(
+    r'(%s)_([a-zA-Z0-9]+)_([0-9]+)_(.+)' % "|".join(map(re.escape, sorted(VALID_JOB_TYPES))),
+    re.DOTALL
+)
 
 
 def parse_config_name(filename: str) -> Dict[str, Any]:
@@ -43,8 +53,28 @@ def parse_config_name(filename: str) -> Dict[str, Any]:
         T2I
     """
     # Extract basename if full path provided
-    basename = os.path.basename(filename)
+    job_type, timestamp_str, index, jobname = _parse_config_basename(
+        os.path.basename(filename)
+    )
     
+    # Fresh dict per call so callers can't mutate the cached result
+    return {
+        "job_type": job_type,
+        "timestamp": timestamp_str,
+        "index": index,
+        "jobname": jobname
+    }
+
+
+@lru_cache(maxsize=4096)
+def _parse_config_basename(basename: str) -> Tuple[str, str, int, str]:
+    """Parse a config basename into (job_type, timestamp, index, jobname).
+    
+    Cached because the monitor re-parses the same filenames on every scan.
+    
+    Raises:
+        ValueError: If basename doesn't match expected format.
+    """
     # Check extension
     if not basename.endswith(".yaml"):
         raise ValueError(f"Config file must have .yaml extension: {basename}")
@@ -52,6 +82,12 @@ def parse_config_name(filename: str) -> Dict[str, Any]:
     # Remove extension
     name_without_ext = basename[:-5]
     
+    # Fast path: one regex walk for the common well-formed name
+    match = _CONFIG_NAME_RE.fullmatch(name_without_ext)
+    if match:
+        job_type, timestamp_str, index_str, jobname = match.groups()
+        return job_type, timestamp_str, int(index_str), jobname
+    
     # Parse using regex - be more specific about errors
     # First check basic structure
     parts = name_without_ext.split("_")
@@ -65,13 +101,13 @@ def parse_config_name(filename: str) -> Dict[str, Any]:
     
     # Validate job type
     if job_type not in VALID_JOB_TYPES:
-        raise ValueError(f"Invalid job type: {job_type}. Must be one of {VALID_JOB_TYPES}")
+        raise ValueError(f"Invalid job type: {job_type}. Must be one of {sorted(VALID_JOB_TYPES)}")
     
     # Validate timestamp OR identifier format
     # Accept either 14-digit timestamp or alphanumeric identifier
     if not (len(timestamp_str) == 14 and timestamp_str.isdigit()):
         # Also accept alphanumeric identifiers (e.g., pg159, book123, etc.)
-        if not re.match(r'^[a-zA-Z0-9]+$', timestamp_str):
+        if not _IDENT_RE.fullmatch(timestamp_str):
             raise ValueError(f"Invalid timestamp/identifier: {timestamp_str}")
     
     # Parse index
@@ -80,12 +116,7 @@ def parse_config_name(filename: str) -> Dict[str, Any]:
     except ValueError:
         raise ValueError(f"Invalid index: {index_str}")
     
-    return {
-        "job_type": job_type,
-        "timestamp": timestamp_str,
-        "index": index,
-        "jobname": jobname
-    }
+    return job_type, timestamp_str, index, jobname
 
 
 def validate_config_schema(cfg: Dict[str, Any], workflows: Dict[str, Any]) -> None:
@@ -123,37 +154,18 @@ def validate_config_schema(cfg: Dict[str, Any], workflows: Dict[str, Any]) -> No
     
     # Check required inputs for workflow
     if "required_inputs" in workflows[workflow_id]:
-        required_inputs = workflows[workflow_id]["required_inputs"]
-        provided_inputs = cfg.get("inputs", {})
-        
-        # Check for both generic and node-specific inputs
-        missing_inputs = []
-        for inp in required_inputs:
-            # First check if generic input exists
-            if inp not in provided_inputs:
-                # Check if any node-specific version exists
-                node_specific_found = False
-                
-                # Special case: "prompt" can be satisfied by "_text" fields
-                if inp == "prompt":
-                    node_specific_found = any(
-                        "_text" in key for key in provided_inputs.keys()
-                    )
-                
-                # General case: check for node-specific version (e.g., "31_seed" for "seed")
-                if not node_specific_found:
-                    node_specific_found = any(
-                        key.endswith(f"_{inp}") for key in provided_inputs.keys()
-                    )
-                
-                if not node_specific_found:
-                    missing_inputs.append(inp)
+        # Jobs of one workflow share the same input keys (only the values
+        # differ), so the check is cached on the shape alone
+        missing_inputs = _missing_inputs(
+            tuple(workflows[workflow_id]["required_inputs"]),
+            frozenset(cfg["inputs"])
+        )
         
         if missing_inputs:
-            raise ValueError(f"Missing required inputs: {missing_inputs}")
+            raise ValueError(f"Missing required inputs: {list(missing_inputs)}")
     
-    # Validate outputs has file_path
-    if "outputs" not in cfg or "file_path" not in cfg.get("outputs", {}):
+    # Validate outputs has file_path (presence of outputs checked above)
+    if "file_path" not in cfg["outputs"]:
         raise ValueError("Missing outputs.file_path")
     
     # Validate priority if present
@@ -163,6 +175,37 @@ def validate_config_schema(cfg: Dict[str, Any], workflows: Dict[str, Any]) -> No
             raise ValueError(f"Priority must be between 1 and 999, got: {priority}")
 
 
+@lru_cache(maxsize=1024)
+def _missing_inputs(required_inputs: Tuple[str, ...],
+                    input_keys: FrozenSet[str]) -> Tuple[str, ...]:
+    """Return the required inputs not satisfied by the provided input keys.
+    
+    An input is satisfied by its generic key or a node-specific one
+    (e.g., "31_seed" for "seed"); "prompt" is also satisfied by any
+    "_text" field.
+    """
+    # Collect every "_"-delimited suffix of every key once so each
+    # required input is a single set lookup
+    node_suffixes = set()
+    for key in input_keys:
+        start = key.find("_")
+        while start != -1:
+            node_suffixes.add(key[start + 1:])
+            start = key.find("_", start + 1)
+    
+    # Check for both generic and node-specific inputs
+    missing_inputs = []
+    for inp in required_inputs:
+        if inp in input_keys or inp in node_suffixes:
+            continue
+        # Special case: "prompt" can be satisfied by "_text" fields
+        if inp == "prompt" and any("_text" in key for key in input_keys):
+            continue
+        missing_inputs.append(inp)
+    
+    return tuple(missing_inputs)
+
+
 def normalize_config(cfg: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
     """Apply default values and normalize config.
     
@@ -174,7 +217,9 @@ def normalize_config(cfg: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str,
         defaults: Default values from global config.
         
     Returns:
-        New normalized config dictionary (original unchanged).
+        New normalized config dictionary (original unchanged). Only
+        top-level keys are written, so nested values such as inputs and
+        outputs are shared with the original rather than copied.
         
     Examples:
         >>> config = {"job_type": "T2I"}
@@ -183,8 +228,8 @@ def normalize_config(cfg: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str,
         >>> print(normalized["priority"])
         50
     """
-    # Create a deep copy to avoid modifying original
-    result = deepcopy(cfg)
+    # Shallow copy is enough: only top-level keys are set below
+    result = dict(cfg)
     
     # Apply default priority if missing
     if "priority" not in result:
@@ -165,8 +165,12 @@ def create_database_schema(db_path: str) -> None:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_productions_book_id ON audiobook_productions(book_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_productions_status ON audiobook_productions(status)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_audiobook_id ON audiobook_process_events(audiobook_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_comfyui_jobs_status_priority ON comfyui_jobs(status, priority)")
         cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_comfyui_jobs_config_name ON comfyui_jobs(config_name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_comfyui_jobs_status_priority_name ON comfyui_jobs(status, priority, config_name)")
+        # (status, priority) is a prefix of the index above, so it only slows writes
+        cursor.execute("DROP INDEX IF EXISTS idx_comfyui_jobs_status_priority")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_comfyui_jobs_priority_name ON comfyui_jobs(priority, config_name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_comfyui_jobs_status_duration ON comfyui_jobs(status, duration)")
 
         # Create gutenberg_books performance indexes
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_gutenberg_author ON gutenberg_books(primary_author)")